@@ -47,7 +47,7 @@ class Node(object):
 
     def add_child(self, child: 'Node') -> None:
         assert self._token is None
-        assert len(child) > 0
+        assert child._children or len(child) > 0
         self._children.append(child)
 
     def add_children(self, *children: 'Node') -> None:
@@ -0,0 +1,276 @@
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from cmaj.lexical.regex import CharClass, Regex
+
+
+class Automaton(Regex):
+    def __init__(self, transitions: List[Dict[str, Optional[int]]], tags: List[Optional[int]],
+                 defaults: Optional[List[Optional[int]]] = None) -> None:
+        assert transitions
+        assert len(transitions) == len(tags)
+        assert defaults is None or len(transitions) == len(defaults)
+        self._transitions = transitions
+        self._tags = tags
+        self._defaults = defaults or len(transitions) * [None]
+
+    @property
+    def num_states(self) -> int:
+        return len(self._transitions)
+
+    def transitions(self, state: int) -> Dict[str, Optional[int]]:
+        return dict(self._transitions[state])
+
+    def default(self, state: int) -> Optional[int]:
+        return self._defaults[state]
+
+    def accepting(self, state: int) -> bool:
+        return self._tags[state] is not None
+
+    def tag(self, state: int) -> Optional[int]:
+        return self._tags[state]
+
+    def match(self, values: str, start: int = 0) -> Optional[int]:
+        return None if (result := self.longest(values, start)) is None else result[1]
+
+    def longest(self, values: str, start: int = 0) -> Optional[Tuple[int, int]]:
+        transitions = self._transitions
+        tags = self._tags
+        defaults = self._defaults
+        state = 0
+        result = None if (tag := tags[0]) is None else (tag, start)
+        for index in range(start, len(values)):
+            if (state := transitions[state].get(values[index], defaults[state])) is None:
+                break
+            if (tag := tags[state]) is not None:
+                result = tag, index + 1
+        return result
+
+
+def compile_regex(regex: Regex) -> Automaton:
+    return compile_tagged([regex])
+
+
+def compile_tagged(regex_list: Sequence[Regex]) -> Automaton:
+    nfa = _Nfa()
+    begin = nfa.new_state()
+    ends: Dict[int, int] = {}
+    for tag, regex in enumerate(regex_list):
+        part_begin, part_end = _build(nfa, regex)
+        nfa.add_epsilon(begin, part_begin)
+        ends[part_end] = tag
+    return _determinize(nfa, begin, ends)
+
+
+class _Nfa(object):
+    def __init__(self) -> None:
+        self._edges: List[Dict[str, Set[int]]] = []
+        self._epsilons: List[Set[int]] = []
+        self._negated_edges: List[List[Tuple[FrozenSet[str], int]]] = []
+        self._closures: Dict[int, FrozenSet[int]] = {}
+
+    def new_state(self) -> int:
+        self._edges.append({})
+        self._epsilons.append(set())
+        self._negated_edges.append([])
+        return len(self._edges) - 1
+
+    def add_edge(self, source: int, value: str, target: int) -> None:
+        self._edges[source].setdefault(value, set()).add(target)
+
+    def add_negated_edge(self, source: int, excluded: AbstractSet[str], target: int) -> None:
+        self._negated_edges[source].append((frozenset(excluded), target))
+
+    def add_epsilon(self, source: int, target: int) -> None:
+        self._epsilons[source].add(target)
+
+    def edges(self, state: int) -> Dict[str, Set[int]]:
+        return self._edges[state]
+
+    def negated_edges(self, state: int) -> List[Tuple[FrozenSet[str], int]]:
+        return self._negated_edges[state]
+
+    def closure(self, states: AbstractSet[int]) -> FrozenSet[int]:
+        return frozenset().union(*(self._state_closure(state) for state in states))
+
+    def _state_closure(self, state: int) -> FrozenSet[int]:
+        if (closure := self._closures.get(state)) is not None:
+            return closure
+        visited = {state}
+        fringe = [state]
+        while fringe:
+            for target in self._epsilons[fringe.pop()]:
+                if target not in visited:
+                    visited.add(target)
+                    fringe.append(target)
+        return self._closures.setdefault(state, frozenset(visited))
+
+
+def _build(nfa: _Nfa, regex: Regex) -> Tuple[int, int]:
+    from cmaj.lexical.regex import Eq, FirstOf, Maybe, Repeat, Seq
+    if isinstance(regex, Eq):
+        return _build_eq(nfa, regex.matcher)
+    if isinstance(regex, CharClass):
+        return _build_char_class(nfa, regex)
+    if isinstance(regex, Maybe):
+        return _build_maybe(nfa, regex.regex)
+    if isinstance(regex, Repeat):
+        return _build_repeat(nfa, regex.regex, regex.min_repeat)
+    if isinstance(regex, FirstOf):
+        return _build_first_of(nfa, regex.regex_list)
+    if isinstance(regex, Seq):
+        return _build_seq(nfa, regex.regex_list)
+    if isinstance(regex, Automaton):
+        return _build_automaton(nfa, regex)
+    raise TypeError(f'Unable to compile regex of type: {type(regex)!r}')
+
+
+def _build_eq(nfa: _Nfa, matcher: str) -> Tuple[int, int]:
+    begin = end = nfa.new_state()
+    for value in matcher:
+        target = nfa.new_state()
+        nfa.add_edge(end, value, target)
+        end = target
+    return begin, end
+
+
+def _build_char_class(nfa: _Nfa, char_class: CharClass) -> Tuple[int, int]:
+    begin = nfa.new_state()
+    end = nfa.new_state()
+    if char_class.negate:
+        nfa.add_negated_edge(begin, char_class.values, end)
+    else:
+        for value in char_class.values:
+            nfa.add_edge(begin, value, end)
+    return begin, end
+
+
+def _build_maybe(nfa: _Nfa, regex: Regex) -> Tuple[int, int]:
+    begin = nfa.new_state()
+    end = nfa.new_state()
+    part_begin, part_end = _build(nfa, regex)
+    nfa.add_epsilon(begin, part_begin)
+    nfa.add_epsilon(part_end, end)
+    nfa.add_epsilon(begin, end)
+    return begin, end
+
+
+def _build_repeat(nfa: _Nfa, regex: Regex, min_repeat: int) -> Tuple[int, int]:
+    begin = end = nfa.new_state()
+    for _ in range(min_repeat):
+        part_begin, part_end = _build(nfa, regex)
+        nfa.add_epsilon(end, part_begin)
+        end = part_end
+    loop_begin, loop_end = _build(nfa, regex)
+    nfa.add_epsilon(end, loop_begin)
+    nfa.add_epsilon(loop_end, end)
+    return begin, end
+
+
+def _build_first_of(nfa: _Nfa, regex_list: Tuple[Regex]) -> Tuple[int, int]:
+    begin = nfa.new_state()
+    end = nfa.new_state()
+    for regex in regex_list:
+        part_begin, part_end = _build(nfa, regex)
+        nfa.add_epsilon(begin, part_begin)
+        nfa.add_epsilon(part_end, end)
+    return begin, end
+
+
+def _build_seq(nfa: _Nfa, regex_list: Tuple[Regex]) -> Tuple[int, int]:
+    begin = end = nfa.new_state()
+    for regex in regex_list:
+        part_begin, part_end = _build(nfa, regex)
+        nfa.add_epsilon(end, part_begin)
+        end = part_end
+    return begin, end
+
+
+def _build_automaton(nfa: _Nfa, automaton: Automaton) -> Tuple[int, int]:
+    begin = nfa.new_state()  # Fresh entry, since transitions may lead back into the start state
+    states = [nfa.new_state() for _ in range(automaton.num_states)]
+    end = nfa.new_state()
+    nfa.add_epsilon(begin, states[0])
+    for state, nfa_state in enumerate(states):
+        transitions = automaton.transitions(state)
+        for value, target in transitions.items():
+            if target is not None:
+                nfa.add_edge(nfa_state, value, states[target])
+        if (default := automaton.default(state)) is not None:
+            nfa.add_negated_edge(nfa_state, transitions.keys(), states[default])
+        if automaton.accepting(state):
+            nfa.add_epsilon(nfa_state, end)
+    return begin, end
+
+
+def _determinize(nfa: _Nfa, begin: int, ends: Dict[int, int]) -> Automaton:
+    start = nfa.closure({begin})
+    indexes: Dict[FrozenSet[int], int] = {start: 0}
+    subsets: List[FrozenSet[int]] = [start]
+
+    def index_of(states: AbstractSet[int]) -> Optional[int]:
+        if not states:
+            return None
+        if (target := nfa.closure(states)) not in indexes:
+            indexes[target] = len(subsets)
+            subsets.append(target)
+        return indexes[target]
+
+    transitions: List[Dict[str, Optional[int]]] = []
+    tags: List[Optional[int]] = []
+    defaults: List[Optional[int]] = []
+    for subset in subsets:
+        moves: Dict[str, Set[int]] = {}
+        negated_edges: List[Tuple[FrozenSet[str], int]] = []
+        for state in subset:
+            for value, targets in nfa.edges(state).items():
+                moves.setdefault(value, set()).update(targets)
+            negated_edges += nfa.negated_edges(state)
+
+        for excluded, _ in negated_edges:
+            for value in excluded:
+                moves.setdefault(value, set())
+        row: Dict[str, Optional[int]] = {}
+        for value in sorted(moves):
+            targets = moves[value] | {target for excluded, target in negated_edges if value not in excluded}
+            if (target_index := index_of(targets)) is not None or negated_edges:
+                row[value] = target_index
+        transitions.append(row)
+        tags.append(min((ends[state] for state in subset if state in ends), default=None))
+        defaults.append(index_of({target for _, target in negated_edges}))
+    return _minimize(transitions, tags, defaults)
+
+
+def _minimize(transitions: List[Dict[str, Optional[int]]], tags: List[Optional[int]],
+              defaults: List[Optional[int]]) -> Automaton:
+    classes: List[Optional[int]] = [0 if tag is None else tag + 1 for tag in tags]
+    num_classes = len(set(classes))
+
+    def class_of(state: Optional[int]) -> Optional[int]:
+        return None if state is None else classes[state]
+
+    while True:
+        signatures: Dict[Tuple, int] = {}
+        refined = [signatures.setdefault((classes[state], class_of(defaults[state]),
+                                          tuple((value, class_of(target)) for value, target in row.items())),
+                                         len(signatures))
+                   for state, row in enumerate(transitions)]
+        if len(signatures) == num_classes:
+            break
+        classes, num_classes = refined, len(signatures)
+
+    indexes: Dict[int, int] = {}
+    for class_ in classes:
+        indexes.setdefault(class_, len(indexes))
+
+    def index_of(state: Optional[int]) -> Optional[int]:
+        return None if state is None else indexes[classes[state]]
+
+    minimal_transitions: List[Optional[Dict[str, Optional[int]]]] = num_classes * [None]
+    minimal_tags: List[Optional[int]] = num_classes * [None]
+    minimal_defaults: List[Optional[int]] = num_classes * [None]
+    for state, row in enumerate(transitions):
+        if minimal_transitions[index := index_of(state)] is None:
+            minimal_transitions[index] = {value: index_of(target) for value, target in row.items()}
+            minimal_tags[index] = tags[state]
+            minimal_defaults[index] = index_of(defaults[state])
+    return Automaton(minimal_transitions, minimal_tags, minimal_defaults)
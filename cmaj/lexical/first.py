@@ -0,0 +1,59 @@
+from typing import FrozenSet, Iterable, Iterator, Optional
+
+from cmaj.lexical.regex import Regex, Seq
+
+
+def first(regex: Regex) -> Optional[FrozenSet[str]]:
+    from cmaj.lexical.automaton import Automaton
+    from cmaj.lexical.regex import CharClass, Eq, FirstOf, Maybe, Repeat
+    if isinstance(regex, Eq):
+        return frozenset(regex.matcher[:1])
+    if isinstance(regex, CharClass):
+        return None if regex.negate else regex.values
+    if isinstance(regex, (Maybe, Repeat)):
+        return first(regex.regex)
+    if isinstance(regex, FirstOf):
+        return _union(first(option) for option in regex.regex_list)
+    if isinstance(regex, Seq):
+        return _union(first(part) for part in _leading(regex))
+    if isinstance(regex, Automaton):
+        if regex.default(0) is not None:
+            return None
+        return frozenset(value for value, target in regex.transitions(0).items() if target is not None)
+    return None
+
+
+def nullable(regex: Regex) -> bool:
+    from cmaj.lexical.automaton import Automaton
+    from cmaj.lexical.regex import CharClass, Eq, FirstOf, Maybe, Repeat
+    if isinstance(regex, Eq):
+        return not regex.matcher
+    if isinstance(regex, CharClass):
+        return False
+    if isinstance(regex, Maybe):
+        return True
+    if isinstance(regex, Repeat):
+        return regex.min_repeat == 0 or nullable(regex.regex)
+    if isinstance(regex, FirstOf):
+        return any(nullable(option) for option in regex.regex_list)
+    if isinstance(regex, Seq):
+        return all(nullable(part) for part in regex.regex_list)
+    if isinstance(regex, Automaton):
+        return regex.accepting(0)
+    return True
+
+
+def _leading(seq: Seq) -> Iterator[Regex]:
+    for part in seq.regex_list:
+        yield part
+        if not nullable(part):
+            break
+
+
+def _union(first_sets: Iterable[Optional[FrozenSet[str]]]) -> Optional[FrozenSet[str]]:
+    result = frozenset()
+    for first_set in first_sets:
+        if first_set is None:
+            return None
+        result |= first_set
+    return result
@@ -0,0 +1,49 @@
+from typing import Iterable, Iterator, List, Tuple
+
+from cmaj.ast.node import Node
+from cmaj.lexical.scanner import Matcher
+
+
+class IncrementalScanner(object):
+    def __init__(self, lines: Iterable[str], matchers: List[Matcher]) -> None:
+        from cmaj.lexical.scanner import scan_line
+        self._matchers = matchers
+        self._lines = list(lines)
+        self._tokens: List[Tuple[int, List[Node]]] = [(index, scan_line(index, line, matchers))
+                                                      for index, line in enumerate(self._lines)]
+
+    @property
+    def lines(self) -> List[str]:
+        return list(self._lines)
+
+    @property
+    def num_lines(self) -> int:
+        return len(self._lines)
+
+    def replace(self, begin: int, end: int, lines: Iterable[str]) -> None:
+        from cmaj.lexical.scanner import scan_line
+        assert 0 <= begin <= end <= len(self._lines)
+        lines = list(lines)
+        tokens = [(index, scan_line(index, line, self._matchers)) for index, line in enumerate(lines, start=begin)]
+        self._lines[begin:end] = lines
+        self._tokens[begin:end] = tokens
+
+    def line_tokens(self, line_index: int) -> List[Node]:
+        scanned_index, nodes = self._tokens[line_index]
+        if scanned_index != line_index:
+            nodes = [_move(node, line_index) for node in nodes]
+            self._tokens[line_index] = line_index, nodes
+        return list(nodes)
+
+    def tokens(self) -> Iterator[Node]:
+        for line_index in range(len(self._tokens)):
+            yield from self.line_tokens(line_index)
+
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, hide={'tokens'})
+
+
+def _move(node: Node, line_index: int) -> Node:
+    from cmaj.ast.node import Token
+    return Node(node.key, token=Token(line_index, node.token.column, node.token.value))
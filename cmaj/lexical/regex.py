@@ -1,8 +1,11 @@
-from typing import Optional, Tuple, Union
+from typing import AbstractSet, FrozenSet, Optional, Pattern, Tuple, Union
 
 
 class Regex(object):
     def __call__(self, values: str) -> Optional[str]:
+        return None if (end := self.match(values)) is None else values[:end]
+
+    def match(self, values: str, start: int = 0) -> Optional[int]:
         raise NotImplementedError()
 
     def __repr__(self) -> str:
@@ -14,8 +17,58 @@ class Eq(Regex):
     def __init__(self, matcher: str) -> None:
         self._matcher = matcher
 
-    def __call__(self, values: str) -> Optional[str]:
-        return self._matcher if values.startswith(self._matcher) else None
+    @property
+    def matcher(self) -> str:
+        return self._matcher
+
+    def match(self, values: str, start: int = 0) -> Optional[int]:
+        return start + len(self._matcher) if values.startswith(self._matcher, start) else None
+
+
+class CharClass(Regex):
+    def __init__(self, *ranges: Union[str, Tuple[str, str]], exclude: str = '', negate: bool = False) -> None:
+        from cmaj.lexical.strings import expand
+        values = {value for range_ in ranges for value in (expand(*range_) if isinstance(range_, tuple) else range_)}
+        self._values = frozenset(values - set(exclude))
+        self._negate = negate
+        self._pattern = _run_pattern(self._values, negate)
+
+    @property
+    def values(self) -> FrozenSet[str]:
+        return self._values
+
+    @property
+    def negate(self) -> bool:
+        return self._negate
+
+    def __contains__(self, value: str) -> bool:
+        return (value in self._values) != self._negate
+
+    def match(self, values: str, start: int = 0) -> Optional[int]:
+        return start + 1 if start < len(values) and values[start] in self else None
+
+    def span(self, values: str, start: int = 0) -> int:
+        return self._pattern.match(values, start).end()
+
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, use={'values': ''.join(sorted(self._values))}, hide={'pattern'})
+
+
+def _run_pattern(values: AbstractSet[str], negate: bool) -> Pattern[str]:
+    import re
+    from typing import List
+    ranges: List[List[int]] = []
+    for code in sorted(ord(value) for value in values):
+        if ranges and ranges[-1][1] + 1 == code:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    items = ''.join(re.escape(chr(begin)) if begin == end else f'{re.escape(chr(begin))}-{re.escape(chr(end))}'
+                    for begin, end in ranges)
+    if not items:
+        return re.compile(r'[\s\S]*' if negate else r'[^\s\S]*')
+    return re.compile(f'[{"^" if negate else ""}{items}]*')
 
 
 StrOrRegex = Union[str, Regex]
@@ -25,8 +78,12 @@ class Maybe(Regex):
     def __init__(self, arg: StrOrRegex) -> None:
         self._regex = unpack_arg(arg)
 
-    def __call__(self, values: str) -> str:
-        return '' if (result := self._regex(values)) is None else result
+    @property
+    def regex(self) -> Regex:
+        return self._regex
+
+    def match(self, values: str, start: int = 0) -> int:
+        return start if (end := self._regex.match(values, start)) is None else end
 
 
 class Repeat(Regex):
@@ -34,23 +91,37 @@ class Repeat(Regex):
         self._regex = unpack_arg(arg)
         self._min_repeat = at_least
 
-    def __call__(self, values: str) -> str:
-        from typing import List
-        parts: List[str] = []
-        while (part := self._regex(values)) is not None:
-            parts.append(part)
-            values = values[len(part):]
-        return None if len(parts) < self._min_repeat else ''.join(parts)
+    @property
+    def regex(self) -> Regex:
+        return self._regex
+
+    @property
+    def min_repeat(self) -> int:
+        return self._min_repeat
+
+    def match(self, values: str, start: int = 0) -> Optional[int]:
+        if isinstance(self._regex, CharClass):
+            end = self._regex.span(values, start)
+            return None if end - start < self._min_repeat else end
+        num_repeat = 0
+        while (end := self._regex.match(values, start)) is not None:
+            num_repeat += 1
+            start = end
+        return None if num_repeat < self._min_repeat else start
 
 
 class FirstOf(Regex):
     def __init__(self, *args: StrOrRegex) -> None:
         self._regex_list = unpack_args(*args)
 
-    def __call__(self, values: str) -> Optional[str]:
+    @property
+    def regex_list(self) -> Tuple[Regex]:
+        return self._regex_list
+
+    def match(self, values: str, start: int = 0) -> Optional[int]:
         for regex in self._regex_list:
-            if (result := regex(values)) is not None:
-                return result
+            if (end := regex.match(values, start)) is not None:
+                return end
         return None
 
 
@@ -58,14 +129,15 @@ class Seq(Regex):
     def __init__(self, *args: StrOrRegex) -> None:
         self._regex_list = unpack_args(*args)
 
-    def __call__(self, values: str) -> Optional[str]:
-        result = ''
+    @property
+    def regex_list(self) -> Tuple[Regex]:
+        return self._regex_list
+
+    def match(self, values: str, start: int = 0) -> Optional[int]:
         for regex in self._regex_list:
-            if (part := regex(values)) is None:
+            if (start := regex.match(values, start)) is None:
                 return None
-            result += part
-            values = values[len(part):]
-        return result
+        return start
 
 
 def unpack_args(*args: Union[str, Regex]) -> Tuple[Regex]:
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from cmaj.ast.node import Node
 from cmaj.lexical.regex import Regex
@@ -7,41 +7,162 @@ from cmaj.lexical.regex import Regex
 class ScannerError(Exception):
     def __init__(self, line_index: int, column_index: int, message: str) -> None:
         super().__init__(f'{line_index}:{column_index} {message}')
+        self._line_index = line_index
+        self._column_index = column_index
+        self._message = message
+
+    def __reduce__(self) -> Tuple[type, Tuple[int, int, str]]:
+        return ScannerError, (self._line_index, self._column_index, self._message)
 
 
 class Matcher(object):
-    def __init__(self, key: str, regex: Regex) -> None:
+    def __init__(self, key: str, regex: Regex, hidden: bool = False) -> None:
         self._key = key
         self._regex = regex
+        self._hidden = hidden
 
-    def match(self, line_index: int, column_index: int, sequence: str) -> Optional[Node]:
-        from cmaj.ast.node import Token
-        if (result := self._regex(sequence)) is not None:
-            return Node(self._key, token=Token(line_index, column_index, result))
-        return None
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def regex(self) -> Regex:
+        return self._regex
+
+    @property
+    def hidden(self) -> bool:
+        return self._hidden
+
+    def find(self, line: str, column_index: int) -> Optional[Tuple['Matcher', int]]:
+        return None if (end := self._regex.match(line, column_index)) is None else (self, end)
+
+    def match(self, line_index: int, column_index: int, line: str) -> Optional[Node]:
+        return _to_node(line_index, column_index, line, self.find(line, column_index))
 
     def __repr__(self) -> str:
         from cmaj.utils.stringify import stringify
         return stringify(self)
 
 
-def scan(lines: List[str], matchers: List[Matcher]) -> List[Node]:
-    return [node for index, line in enumerate(lines) for node in scan_line(index, line, matchers)]
+class CombinedMatcher(object):
+    def __init__(self, matchers: List[Matcher]) -> None:
+        from cmaj.lexical.automaton import compile_tagged
+        self._matchers = list(matchers)
+        self._automaton = compile_tagged([matcher.regex for matcher in matchers])
+
+    def find(self, line: str, column_index: int) -> Optional[Tuple[Matcher, int]]:
+        if (result := self._automaton.longest(line, column_index)) is not None:
+            tag, end = result
+            return self._matchers[tag], end
+        return None
+
+    def match(self, line_index: int, column_index: int, line: str) -> Optional[Node]:
+        return _to_node(line_index, column_index, line, self.find(line, column_index))
+
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, hide={'automaton'})
+
+
+class MatcherSet(object):
+    def __init__(self, matchers: List[Matcher]) -> None:
+        from typing import Dict
+        from cmaj.lexical.first import first, nullable
+        first_sets = [None if nullable(matcher.regex) else first(matcher.regex) for matcher in matchers]
+        self._fallback = tuple(matcher for matcher, first_set in zip(matchers, first_sets) if first_set is None)
+        self._candidates: Dict[str, Tuple[Matcher, ...]] = {}
+        for value in sorted({value for first_set in first_sets if first_set is not None for value in first_set}):
+            self._candidates[value] = tuple(matcher for matcher, first_set in zip(matchers, first_sets)
+                                            if first_set is None or value in first_set)
+
+    def candidates(self, value: str) -> Tuple[Matcher, ...]:
+        return self._candidates.get(value, self._fallback)
 
+    def find(self, line: str, column_index: int) -> Optional[Tuple[Matcher, int]]:
+        for matcher in self.candidates(line[column_index]):
+            if (result := matcher.find(line, column_index)) is not None:
+                return result
+        return None
+
+    def match(self, line_index: int, column_index: int, line: str) -> Optional[Node]:
+        return _to_node(line_index, column_index, line, self.find(line, column_index))
+
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, hide={'candidates'})
 
-def scan_line(line_index: int, line: str, matchers: List[Matcher]) -> List[Node]:
+
+def _to_node(line_index: int, column_index: int, line: str, result: Optional[Tuple[Matcher, int]]) -> Optional[Node]:
+    from cmaj.ast.node import Token
+    if result is None:
+        return None
+    matcher, end = result
+    return Node(matcher.key, token=Token(line_index, column_index, line[column_index:end]))
+
+
+def scan(lines: Iterable[str], matchers: List[Matcher], hidden: Optional[List[Node]] = None) -> List[Node]:
+    return list(scan_iter(lines, matchers, hidden=hidden))
+
+
+def scan_iter(lines: Iterable[str], matchers: List[Matcher], hidden: Optional[List[Node]] = None) -> Iterator[Node]:
+    for index, line in enumerate(lines):
+        yield from scan_line(index, line, matchers, hidden=hidden)
+
+
+def scan_parallel(lines: Sequence[str], matchers: List[Matcher], hidden: Optional[List[Node]] = None,
+                  max_workers: Optional[int] = None, chunk_size: int = 1024) -> List[Node]:
+    from concurrent.futures import ProcessPoolExecutor
+    assert chunk_size > 0
+    chunks = ((begin, lines[begin:begin + chunk_size]) for begin in range(0, len(lines), chunk_size))
+    nodes: List[Node] = []
+    initargs = (matchers, hidden is not None)
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=initargs) as executor:
+        for chunk_nodes, chunk_hidden in executor.map(_scan_chunk, chunks):
+            nodes += chunk_nodes
+            if hidden is not None:
+                hidden += chunk_hidden
+    return nodes
+
+
+_worker_matchers: List[Matcher] = []
+_worker_keeps_hidden = False
+
+
+def _init_worker(matchers: List[Matcher], keeps_hidden: bool) -> None:
+    global _worker_matchers, _worker_keeps_hidden
+    _worker_matchers = matchers
+    _worker_keeps_hidden = keeps_hidden
+
+
+def _scan_chunk(chunk: Tuple[int, Sequence[str]]) -> Tuple[List[Node], Optional[List[Node]]]:
+    first_index, lines = chunk
+    nodes: List[Node] = []
+    hidden: Optional[List[Node]] = [] if _worker_keeps_hidden else None
+    for index, line in enumerate(lines, start=first_index):
+        nodes += scan_line(index, line, _worker_matchers, hidden=hidden)
+    return nodes, hidden
+
+
+def scan_line(line_index: int, line: str, matchers: List[Matcher], hidden: Optional[List[Node]] = None) -> List[Node]:
     nodes = []
     column_index = 0
     while column_index < len(line):
-        node = scan_next(line_index, column_index, line[column_index:], matchers)
-        nodes.append(node)
-        column_index += len(node)
+        matcher, end = find_next(line_index, column_index, line, matchers)
+        if not matcher.hidden:
+            nodes.append(_to_node(line_index, column_index, line, (matcher, end)))
+        elif hidden is not None:
+            hidden.append(_to_node(line_index, column_index, line, (matcher, end)))
+        column_index = end
     return nodes
 
 
-def scan_next(line_index: int, column_index: int, sequence: str, matchers: List[Matcher]) -> Node:
+def scan_next(line_index: int, column_index: int, line: str, matchers: List[Matcher]) -> Node:
+    return _to_node(line_index, column_index, line, find_next(line_index, column_index, line, matchers))
+
+
+def find_next(line_index: int, column_index: int, line: str, matchers: List[Matcher]) -> Tuple[Matcher, int]:
     for matcher in matchers:
-        if (node := matcher.match(line_index, column_index, sequence)) is not None:
-            assert len(node) > 0
-            return node
-    raise ScannerError(line_index, column_index, f'Unexpected token: {sequence[0]!r}')
+        if (result := matcher.find(line, column_index)) is not None:
+            assert result[1] > column_index
+            return result
+    raise ScannerError(line_index, column_index, f'Unexpected token: {line[column_index]!r}')
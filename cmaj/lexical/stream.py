@@ -0,0 +1,87 @@
+from typing import Iterable, Iterator, List
+
+from cmaj.ast.node import Node
+from cmaj.lexical.scanner import Matcher
+
+
+class TokenStream(object):
+    def __init__(self, source: str) -> None:
+        from array import array
+        from typing import Dict
+        self._source = source
+        self._keys: List[str] = []
+        self._kind_of: Dict[str, int] = {}
+        self._kinds = array('i')
+        self._lines = array('i')
+        self._columns = array('i')
+        self._starts = array('i')
+        self._lengths = array('i')
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def kind_of(self, key: str) -> int:
+        if (kind := self._kind_of.get(key)) is None:
+            kind = self._kind_of[key] = len(self._keys)
+            self._keys.append(key)
+        return kind
+
+    def append(self, key: str, line: int, column: int, start: int, length: int) -> None:
+        assert 0 <= start and start + length <= len(self._source)
+        self._kinds.append(self.kind_of(key))
+        self._lines.append(line)
+        self._columns.append(column)
+        self._starts.append(start)
+        self._lengths.append(length)
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def kind(self, index: int) -> int:
+        return self._kinds[index]
+
+    def key(self, index: int) -> str:
+        return self._keys[self._kinds[index]]
+
+    def line(self, index: int) -> int:
+        return self._lines[index]
+
+    def column(self, index: int) -> int:
+        return self._columns[index]
+
+    def value(self, index: int) -> str:
+        start = self._starts[index]
+        return self._source[start:start + self._lengths[index]]
+
+    def node(self, index: int) -> Node:
+        from cmaj.ast.node import Token
+        return Node(self.key(index), token=Token(self._lines[index], self._columns[index], self.value(index)))
+
+    def __iter__(self) -> Iterator[Node]:
+        return (self.node(index) for index in range(len(self)))
+
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, use={'tokens': len(self)}, hide={'source', 'kind_of', 'kinds', 'lines', 'columns',
+                                                                 'starts', 'lengths'})
+
+
+def scan_stream(lines: Iterable[str], matchers: List[Matcher]) -> TokenStream:
+    from cmaj.lexical.scanner import find_next
+    lines = list(lines)
+    stream = TokenStream(''.join(lines))
+    line_start = 0
+    for line_index, line in enumerate(lines):
+        column_index = 0
+        while column_index < len(line):
+            matcher, end = find_next(line_index, column_index, line, matchers)
+            if not matcher.hidden:
+                stream.append(matcher.key, line_index, column_index, line_start + column_index, end - column_index)
+            column_index = end
+        line_start += len(line)
+    return stream
@@ -0,0 +1,102 @@
+from unittest import TestCase
+
+from cmaj.lexical.automaton import compile_regex
+from cmaj.lexical.regex import Eq, FirstOf, Maybe, Repeat, Seq
+
+
+class CompileTest(TestCase):
+    def test_given_eq_then_match_prefix(self) -> None:
+        automaton = compile_regex(Eq('abc'))
+        self.assertEqual('abc', automaton('abcd'))
+        self.assertIsNone(automaton('abd'))
+
+    def test_given_empty_eq_then_match_empty(self) -> None:
+        automaton = compile_regex(Eq(''))
+        self.assertEqual('', automaton('abc'))
+
+    def test_given_maybe_then_match_optional(self) -> None:
+        automaton = compile_regex(Seq('a', Maybe('b'), 'c'))
+        self.assertEqual('abc', automaton('abc'))
+        self.assertEqual('ac', automaton('acb'))
+        self.assertIsNone(automaton('abb'))
+
+    def test_given_repeat_then_match_all_repetitions(self) -> None:
+        automaton = compile_regex(Repeat('ab'))
+        self.assertEqual('ababab', automaton('abababa'))
+        self.assertEqual('', automaton('ba'))
+
+    def test_given_repeat_at_least_then_match_minimum_repetitions(self) -> None:
+        automaton = compile_regex(Repeat('a', at_least=2))
+        self.assertEqual('aaa', automaton('aaab'))
+        self.assertEqual('aa', automaton('aab'))
+        self.assertIsNone(automaton('ab'))
+
+    def test_given_first_of_then_match_any_option(self) -> None:
+        automaton = compile_regex(FirstOf('a', 'b', Seq('c', 'd')))
+        self.assertEqual('a', automaton('ab'))
+        self.assertEqual('b', automaton('ba'))
+        self.assertEqual('cd', automaton('cdc'))
+        self.assertIsNone(automaton('ce'))
+
+    def test_given_overlapping_options_then_longest_match(self) -> None:
+        automaton = compile_regex(FirstOf('a', 'ab'))
+        self.assertEqual('ab', automaton('abc'))
+
+    def test_given_compiled_regex_then_same_results_as_combinators(self) -> None:
+        from cmaj.lexical.strings import expand
+        regex = Seq('"', Repeat(FirstOf(*expand(' ', '~', exclude='"')), at_least=1), '"')
+        automaton = compile_regex(regex)
+        for values in ['"hello world" x', '""', '"open', 'x"y"', '"a""b"']:
+            self.assertEqual(regex(values), automaton(values))
+
+    def test_given_nested_automaton_then_compile_as_regex(self) -> None:
+        automaton = compile_regex(Seq(compile_regex(Repeat('a', at_least=1)), 'b'))
+        self.assertEqual('aab', automaton('aabb'))
+        self.assertIsNone(automaton('b'))
+
+    def test_given_maybe_of_automaton_with_looping_start_then_no_partial_match(self) -> None:
+        from cmaj.lexical.regex import Maybe
+        automaton = compile_regex(Maybe(compile_regex(Seq(Repeat('a'), 'b'))))
+        self.assertEqual('', automaton('aaa'))
+        self.assertEqual('aab', automaton('aab'))
+        automaton = compile_regex(Maybe(compile_regex(Seq(Repeat('ab'), 'c'))))
+        self.assertEqual('', automaton('ab'))
+        self.assertEqual('abc', automaton('abc'))
+
+    def test_given_maybe_of_repeat_then_skip_does_not_enter_loop(self) -> None:
+        from cmaj.lexical.regex import Maybe
+        automaton = compile_regex(Maybe(Repeat('c', at_least=2)))
+        self.assertEqual('', automaton('c'))
+        self.assertEqual('ccc', automaton('ccc'))
+
+    def test_given_number_literal_with_optional_fraction_then_dot_required(self) -> None:
+        from cmaj.lexical.regex import CharClass, Maybe
+        digit = CharClass(('0', '9'))
+        automaton = compile_regex(Seq(digit, Maybe(Seq('.', Repeat(digit, at_least=1)))))
+        self.assertEqual('1', automaton('15'))
+        self.assertEqual('1.5', automaton('1.5'))
+        self.assertEqual('1', automaton('1.'))
+
+    def test_given_unknown_regex_then_error(self) -> None:
+        from cmaj.lexical.regex import Regex
+        self.assertRaises(TypeError, compile_regex, Regex())
+
+    def test_given_char_class_then_match_members(self) -> None:
+        from cmaj.lexical.regex import CharClass
+        automaton = compile_regex(Repeat(CharClass(('a', 'z'), exclude='x'), at_least=1))
+        self.assertEqual('abc', automaton('abcxa'))
+        self.assertIsNone(automaton('xa'))
+
+    def test_given_negated_char_class_then_match_non_members(self) -> None:
+        from cmaj.lexical.regex import CharClass
+        automaton = compile_regex(Seq('"', Repeat(CharClass('"', negate=True)), '"'))
+        self.assertEqual('"ä b"', automaton('"ä b" c'))
+        self.assertIsNone(automaton('"open'))
+
+    def test_given_negated_char_class_and_overlapping_option_then_longest_match(self) -> None:
+        from cmaj.lexical.regex import CharClass
+        automaton = compile_regex(FirstOf(Seq(CharClass('ab', negate=True), 'x'), 'a', Seq('c', 'yz')))
+        self.assertEqual('cx', automaton('cx'))
+        self.assertEqual('cyz', automaton('cyz'))
+        self.assertEqual('a', automaton('ax'))
+        self.assertIsNone(automaton('bx'))
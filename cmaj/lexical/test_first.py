@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from cmaj.lexical.first import first, nullable
+from cmaj.lexical.regex import Eq, FirstOf, Maybe, Regex, Repeat, Seq
+
+
+class FirstTest(TestCase):
+    def test_given_eq_then_first_character(self) -> None:
+        self.assertEqual({'a'}, first(Eq('abc')))
+        self.assertEqual(set(), first(Eq('')))
+
+    def test_given_first_of_then_union_of_options(self) -> None:
+        from cmaj.lexical.strings import expand
+        self.assertEqual(set(expand('a', 'z')) | {'_'}, first(FirstOf(*expand('a', 'z'), '_')))
+
+    def test_given_seq_with_nullable_prefix_then_union_up_to_first_non_nullable_part(self) -> None:
+        self.assertEqual({'a', 'b', 'c'}, first(Seq(Maybe('a'), Repeat('b'), 'c', 'd')))
+
+    def test_given_unknown_regex_then_none(self) -> None:
+        self.assertIsNone(first(Regex()))
+        self.assertIsNone(first(Seq(Maybe('a'), Regex())))
+        self.assertEqual({'a'}, first(Seq('a', Regex())))
+
+    def test_given_automaton_then_initial_transitions(self) -> None:
+        from cmaj.lexical.automaton import compile_regex
+        self.assertEqual({'x', 'y'}, first(compile_regex(FirstOf('xa', 'ya'))))
+
+
+class NullableTest(TestCase):
+    def test_given_optional_regex_then_nullable(self) -> None:
+        self.assertTrue(nullable(Maybe('a')))
+        self.assertTrue(nullable(Repeat('a')))
+        self.assertTrue(nullable(Seq(Repeat('a'), Maybe('b'))))
+        self.assertTrue(nullable(FirstOf('a', Eq(''))))
+
+    def test_given_mandatory_regex_then_not_nullable(self) -> None:
+        self.assertFalse(nullable(Eq('a')))
+        self.assertFalse(nullable(Repeat('a', at_least=1)))
+        self.assertFalse(nullable(Seq(Maybe('a'), 'b')))
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from cmaj.lexical.incremental import IncrementalScanner
+
+
+class IncrementalScannerTest(TestCase):
+    LINES = ['A = a\n', 'B = b\n', 'C = c\n']
+
+    def test_given_lines_then_same_tokens_as_scan(self) -> None:
+        from cmaj.lexical.scanner import scan
+        from cmaj.meta.matchers import matchers
+        scanner = IncrementalScanner(self.LINES, matchers())
+        self.assertEqual(scan(self.LINES, matchers()), list(scanner.tokens()))
+
+    def test_when_replacing_line_then_same_tokens_as_scan(self) -> None:
+        from cmaj.lexical.scanner import scan
+        from cmaj.meta.matchers import matchers
+        scanner = IncrementalScanner(self.LINES, matchers())
+        scanner.replace(1, 2, ["B = 'b' | b\n"])
+        self.assertEqual(['A = a\n', "B = 'b' | b\n", 'C = c\n'], scanner.lines)
+        self.assertEqual(scan(scanner.lines, matchers()), list(scanner.tokens()))
+
+    def test_when_inserting_and_removing_lines_then_following_lines_are_shifted(self) -> None:
+        from cmaj.lexical.scanner import scan
+        from cmaj.meta.matchers import matchers
+        scanner = IncrementalScanner(self.LINES, matchers())
+        scanner.replace(0, 0, ['# header\n', '\n'])
+        self.assertEqual(scan(scanner.lines, matchers()), list(scanner.tokens()))
+        scanner.replace(1, 3, [])
+        self.assertEqual(3, scanner.num_lines)
+        self.assertEqual(scan(scanner.lines, matchers()), list(scanner.tokens()))
+
+    def test_when_edit_has_unexpected_token_then_error_and_unchanged(self) -> None:
+        from cmaj.lexical.scanner import ScannerError, scan
+        from cmaj.meta.matchers import matchers
+        scanner = IncrementalScanner(self.LINES, matchers())
+        self.assertRaises(ScannerError, scanner.replace, 0, 1, ['A = ?\n'])
+        self.assertEqual(self.LINES, scanner.lines)
+        self.assertEqual(scan(self.LINES, matchers()), list(scanner.tokens()))
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+from cmaj.lexical.regex import Eq, FirstOf, Maybe, Repeat, Seq
+
+
+class MatchTest(TestCase):
+    def test_given_eq_then_end_offset_after_start(self) -> None:
+        self.assertEqual(4, Eq('cd').match('abcde', 2))
+        self.assertIsNone(Eq('cd').match('abcde', 1))
+
+    def test_given_maybe_then_start_if_no_match(self) -> None:
+        self.assertEqual(2, Maybe('x').match('abcde', 2))
+        self.assertEqual(3, Maybe('c').match('abcde', 2))
+
+    def test_given_repeat_then_end_of_last_repetition(self) -> None:
+        self.assertEqual(5, Repeat('a').match('xxaaab', 2))
+        self.assertIsNone(Repeat('a', at_least=4).match('xxaaab', 2))
+
+    def test_given_first_of_then_end_of_first_match(self) -> None:
+        self.assertEqual(2, FirstOf('b', 'bc').match('abcd', 1))
+
+    def test_given_seq_then_end_of_all_parts(self) -> None:
+        self.assertEqual(5, Seq('b', Maybe('x'), Repeat('c', at_least=1), 'd').match('abccd', 1))
+        self.assertIsNone(Seq('b', 'd').match('abcd', 1))
+
+    def test_given_str_then_call_returns_matched_prefix(self) -> None:
+        self.assertEqual('aab', Seq(Repeat('a'), 'b')('aabb'))
+        self.assertIsNone(Seq(Repeat('a'), 'b')('aac'))
+
+
+class CharClassTest(TestCase):
+    def test_given_ranges_and_values_then_match_members(self) -> None:
+        from cmaj.lexical.regex import CharClass
+        char_class = CharClass(('a', 'c'), ('X', 'Z'), '_-')
+        self.assertEqual(set('abcXYZ_-'), char_class.values)
+        self.assertEqual(2, char_class.match('x-y', 1))
+        self.assertIsNone(char_class.match('d'))
+        self.assertIsNone(char_class.match('ab', 2))
+
+    def test_given_exclusions_then_excluded_values_do_not_match(self) -> None:
+        from cmaj.lexical.regex import CharClass
+        char_class = CharClass((' ', '~'), exclude='"\'')
+        self.assertEqual(1, char_class.match('a'))
+        self.assertIsNone(char_class.match('"'))
+        self.assertIsNone(char_class.match("'"))
+
+    def test_given_negation_then_match_non_members(self) -> None:
+        from cmaj.lexical.regex import CharClass
+        char_class = CharClass('"\n', negate=True)
+        self.assertEqual(1, char_class.match('ä'))
+        self.assertIsNone(char_class.match('"'))
+        self.assertIsNone(char_class.match('\n'))
+
+    def test_given_repeated_char_class_then_match_run(self) -> None:
+        from cmaj.lexical.regex import CharClass
+        self.assertEqual(6, Repeat(CharClass('"', negate=True)).match('"a]b-\\"', 1))
+        self.assertEqual(4, Repeat(CharClass(('a', 'z'), '^-'), at_least=2).match('a^-b]'))
+        self.assertIsNone(Repeat(CharClass(('a', 'z')), at_least=2).match('a1'))
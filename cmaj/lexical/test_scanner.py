@@ -0,0 +1,113 @@
+from unittest import TestCase
+
+from cmaj.ast.node import Node, Token
+from cmaj.lexical.scanner import ScannerError, scan, scan_line
+
+
+class ScanTest(TestCase):
+    def test_given_line_then_tokens_with_columns(self) -> None:
+        from cmaj.meta.matchers import matchers
+        nodes = scan_line(3, "A = 'a' | b\n", matchers())
+        expected = [Node('identifier', Token(3, 0, 'A')), Node('=', Token(3, 2, '=')),
+                    Node('string', Token(3, 4, "'a'")), Node('|', Token(3, 8, '|')),
+                    Node('identifier', Token(3, 10, 'b')), Node('eol', Token(3, 11, '\n'))]
+        self.assertEqual(expected, nodes)
+
+    def test_given_lines_then_tokens_with_line_indexes(self) -> None:
+        from cmaj.meta.matchers import matchers
+        nodes = scan(['A = a\n', '# comment\n'], matchers())
+        self.assertEqual([0, 0, 0, 0, 1, 1], [node.token.line for node in nodes])
+
+    def test_given_hidden_matcher_then_tokens_on_side_channel(self) -> None:
+        from cmaj.meta.matchers import matchers
+        hidden = []
+        nodes = scan(['A = a\n', ' b\n'], matchers(), hidden=hidden)
+        self.assertEqual(['identifier', '=', 'identifier', 'eol', 'identifier', 'eol'], [node.key for node in nodes])
+        self.assertEqual([Node('space', Token(0, 1, ' ')), Node('space', Token(0, 3, ' ')),
+                          Node('space', Token(1, 0, ' '))], hidden)
+
+    def test_given_unexpected_character_then_error(self) -> None:
+        from cmaj.meta.matchers import matchers
+        self.assertRaises(ScannerError, scan_line, 0, 'A = ?', matchers())
+
+
+class CombinedMatcherTest(TestCase):
+    def test_given_meta_matchers_then_same_tokens_as_matcher_list(self) -> None:
+        from cmaj.lexical.scanner import CombinedMatcher
+        from cmaj.meta.matchers import matchers
+        lines = ["# meta grammar\n", "A = B 'x' | \"y\" c_d\n", "\n"]
+        self.assertEqual(scan(lines, matchers()), scan(lines, [CombinedMatcher(matchers())]))
+
+    def test_given_overlapping_matchers_then_longest_match(self) -> None:
+        from cmaj.lexical.regex import Eq
+        from cmaj.lexical.scanner import CombinedMatcher, Matcher
+        combined = CombinedMatcher([Matcher('eq', Eq('=')), Matcher('eqeq', Eq('=='))])
+        self.assertEqual([Node('eqeq', Token(0, 0, '==')), Node('eq', Token(0, 2, '='))],
+                         scan_line(0, '===', [combined]))
+
+    def test_given_equal_match_length_then_first_matcher_wins(self) -> None:
+        from cmaj.lexical.regex import Eq, FirstOf, Repeat
+        from cmaj.lexical.scanner import CombinedMatcher, Matcher
+        combined = CombinedMatcher([Matcher('keyword', Eq('if')), Matcher('name', Repeat(FirstOf('i', 'f'), 1))])
+        self.assertEqual([Node('keyword', Token(0, 0, 'if'))], scan_line(0, 'if', [combined]))
+        self.assertEqual([Node('name', Token(0, 0, 'iff'))], scan_line(0, 'iff', [combined]))
+
+    def test_given_optional_tail_with_repeat_then_same_tokens_as_matcher_list(self) -> None:
+        from cmaj.lexical.regex import CharClass, Eq, Maybe, Repeat, Seq
+        from cmaj.lexical.scanner import CombinedMatcher, Matcher
+        digit = CharClass(('0', '9'))
+        matchers = [Matcher('num', Seq(digit, Maybe(Seq('.', Repeat(digit, at_least=1))))), Matcher('dot', Eq('.'))]
+        self.assertEqual([Node('num', Token(0, 0, '1')), Node('num', Token(0, 1, '5'))],
+                         scan_line(0, '15', [CombinedMatcher(matchers)]))
+        for line in ['15', '1.5', '1.']:
+            self.assertEqual(scan_line(0, line, matchers), scan_line(0, line, [CombinedMatcher(matchers)]))
+
+    def test_given_unexpected_character_then_error(self) -> None:
+        from cmaj.lexical.scanner import CombinedMatcher
+        from cmaj.meta.matchers import matchers
+        self.assertRaises(ScannerError, scan_line, 0, 'A = ?', [CombinedMatcher(matchers())])
+
+
+class MatcherSetTest(TestCase):
+    def test_given_meta_matchers_then_same_tokens_as_matcher_list(self) -> None:
+        from cmaj.lexical.scanner import MatcherSet
+        from cmaj.meta.matchers import matchers
+        lines = ["# meta grammar\n", "A = B 'x' | \"y\" c_d\n", "\n"]
+        self.assertEqual(scan(lines, matchers()), scan(lines, [MatcherSet(matchers())]))
+
+    def test_given_character_then_only_matchers_starting_with_character(self) -> None:
+        from cmaj.lexical.regex import Eq, FirstOf, Maybe, Repeat
+        from cmaj.lexical.scanner import Matcher, MatcherSet
+        a, b, ab, optional = (Matcher('a', Eq('a')), Matcher('b', Repeat('b', at_least=1)),
+                              Matcher('ab', FirstOf('a', 'b')), Matcher('optional', Maybe('c')))
+        matcher_set = MatcherSet([a, b, ab, optional])
+        self.assertEqual((a, ab, optional), matcher_set.candidates('a'))
+        self.assertEqual((b, ab, optional), matcher_set.candidates('b'))
+        self.assertEqual((optional,), matcher_set.candidates('x'))
+
+
+class ScanParallelTest(TestCase):
+    def test_given_chunks_then_same_tokens_as_sequential_scan(self) -> None:
+        from cmaj.lexical.scanner import scan_parallel
+        from cmaj.meta.matchers import matchers
+        lines = ["# meta grammar\n", "A = B 'x' | \"y\" c_d\n", "\n", "B = b\n", "C = c | B\n"]
+        hidden = []
+        nodes = scan_parallel(lines, matchers(), hidden=hidden, max_workers=2, chunk_size=2)
+        expected_hidden = []
+        self.assertEqual(scan(lines, matchers(), hidden=expected_hidden), nodes)
+        self.assertEqual(expected_hidden, hidden)
+
+    def test_given_no_hidden_list_then_workers_skip_hidden_nodes(self) -> None:
+        from cmaj.lexical.scanner import _init_worker, _scan_chunk
+        from cmaj.meta.matchers import matchers
+        lines = ["A = B 'x'\n"]
+        self.addCleanup(_init_worker, [], False)
+        _init_worker(matchers(), False)
+        self.assertEqual((scan(lines, matchers()), None), _scan_chunk((0, lines)))
+        _init_worker(matchers(), True)
+        self.assertEqual(3, len(_scan_chunk((0, lines))[1]))
+
+    def test_given_scanner_error_in_chunk_then_error(self) -> None:
+        from cmaj.lexical.scanner import scan_parallel
+        from cmaj.meta.matchers import matchers
+        self.assertRaises(ScannerError, scan_parallel, ['A = a\n', 'B = ?\n'], matchers(), max_workers=2, chunk_size=1)
@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from cmaj.lexical.stream import TokenStream, scan_stream
+
+
+class TokenStreamTest(TestCase):
+    def test_given_tokens_then_columns_and_lazy_values(self) -> None:
+        stream = TokenStream('ab\ncd')
+        stream.append('x', 0, 0, 0, 2)
+        stream.append('y', 1, 1, 4, 1)
+        stream.append('x', 1, 0, 3, 1)
+        self.assertEqual(3, len(stream))
+        self.assertEqual(['x', 'y'], stream.keys)
+        self.assertEqual([0, 1, 0], [stream.kind(index) for index in range(3)])
+        self.assertEqual(['ab', 'd', 'c'], [stream.value(index) for index in range(3)])
+        self.assertEqual([(0, 0), (1, 1), (1, 0)], [(stream.line(index), stream.column(index)) for index in range(3)])
+
+    def test_given_lines_then_same_tokens_as_scan(self) -> None:
+        from cmaj.lexical.scanner import scan
+        from cmaj.meta.matchers import matchers
+        lines = ["# meta grammar\n", "A = B 'x' | \"y\" c_d\n", "\n"]
+        self.assertEqual(scan(lines, matchers()), list(scan_stream(lines, matchers())))
+
+    def test_given_stream_then_parse_tree(self) -> None:
+        from cmaj.meta.matchers import matchers
+        from cmaj.meta.parser import meta_grammar, meta_table, parse
+        from cmaj.parser.lr1 import parse as parse_tokens
+        lines = ['A = a | B\n', 'B = b\n']
+        stream = scan_stream(lines, matchers())
+        self.assertEqual(parse(lines, meta_grammar(), meta_table()), parse_tokens(stream, meta_grammar(), meta_table()))
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Callable, Deque, Iterable, List, Mapping
 
 from cmaj.ast.node import Node
 from cmaj.parser.grammar import Grammar, Rule
@@ -30,3 +30,36 @@ def compile_symbol(anchor_node: Node) -> str:
     if anchor_node.key == 'identifier':
         return anchor_node.token.value
     return anchor_node.token.value[1:-1]
+
+
+def compile_lines(lines: Iterable[str]) -> Grammar:
+    from cmaj.lexical.scanner import scan_iter
+    from cmaj.meta.matchers import matchers
+    from cmaj.meta.parser import meta_grammar, meta_table
+    from cmaj.parser.lr1 import evaluate
+    rules = evaluate(scan_iter(lines, matchers()), meta_grammar(), meta_table(), meta_callbacks())
+    return Grammar(*rules)
+
+
+def meta_callbacks() -> Mapping[Rule, Callable[[List[Any]], Any]]:
+    from collections import deque
+    return {
+        Rule('GRAMMAR', ['LINE', 'GRAMMAR']): lambda values: _extend_left(values[1], values[0]),
+        Rule('GRAMMAR', ['LINE']): lambda values: deque(values[0]),
+        Rule('LINE', ['DEFINITION', 'eol']): lambda values: values[0],
+        Rule('LINE', ['comment', 'eol']): lambda values: [],
+        Rule('LINE', ['eol']): lambda values: [],
+        Rule('DEFINITION', ['identifier', '=', 'OPTION']):
+            lambda values: [Rule(values[0].token.value, list(symbols)) for symbols in values[2]],
+        Rule('OPTION', ['SEQUENCE', '|', 'OPTION']): lambda values: _extend_left(values[2], [values[0]]),
+        Rule('OPTION', ['SEQUENCE']): lambda values: deque([values[0]]),
+        Rule('SEQUENCE', ['ANCHOR', 'SEQUENCE']): lambda values: _extend_left(values[1], [values[0]]),
+        Rule('SEQUENCE', ['ANCHOR']): lambda values: deque([values[0]]),
+        Rule('ANCHOR', ['string']): lambda values: compile_symbol(values[0]),
+        Rule('ANCHOR', ['identifier']): lambda values: compile_symbol(values[0]),
+    }
+
+
+def _extend_left(values: Deque[Any], head: List[Any]) -> Deque[Any]:
+    values.extendleft(reversed(head))
+    return values
@@ -8,31 +8,28 @@ def matchers() -> List[Matcher]:
 
 
 def comments() -> Matcher:
-    from cmaj.lexical.regex import FirstOf, Repeat, Seq
-    from cmaj.lexical.strings import expand
-    comment = Seq('#', ' ', Repeat(FirstOf(*expand(' ', '~')), at_least=1))
+    from cmaj.lexical.regex import CharClass, Repeat, Seq
+    comment = Seq('#', ' ', Repeat(CharClass((' ', '~')), at_least=1))
     return Matcher('comment', comment)
 
 
 def strings() -> Matcher:
-    from cmaj.lexical.regex import FirstOf, Repeat, Seq
-    from cmaj.lexical.strings import expand
-    single_quoted_string = Seq("'", Repeat(FirstOf(*expand(' ', '~', exclude="'")), at_least=1), "'")
-    double_quoted_string = Seq('"', Repeat(FirstOf(*expand(' ', '~', exclude='"')), at_least=1), '"')
+    from cmaj.lexical.regex import CharClass, FirstOf, Repeat, Seq
+    single_quoted_string = Seq("'", Repeat(CharClass((' ', '~'), exclude="'"), at_least=1), "'")
+    double_quoted_string = Seq('"', Repeat(CharClass((' ', '~'), exclude='"'), at_least=1), '"')
     return Matcher('string', FirstOf(single_quoted_string, double_quoted_string))
 
 
 def identifiers() -> Matcher:
-    from cmaj.lexical.regex import FirstOf, Repeat
-    from cmaj.lexical.strings import expand
-    terminal = Repeat(FirstOf(*expand('a', 'z'), '_'), at_least=1)
-    reference = Repeat(FirstOf(*expand('A', 'Z'), '_'), at_least=1)
+    from cmaj.lexical.regex import CharClass, FirstOf, Repeat
+    terminal = Repeat(CharClass(('a', 'z'), '_'), at_least=1)
+    reference = Repeat(CharClass(('A', 'Z'), '_'), at_least=1)
     return Matcher('identifier', FirstOf(terminal, reference))
 
 
 def spaces() -> Matcher:
     from cmaj.lexical.regex import Repeat
-    return Matcher('space', Repeat(' ', at_least=1))
+    return Matcher('space', Repeat(' ', at_least=1), hidden=True)
 
 
 def symbols() -> List[Matcher]:
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable
 
 from cmaj.ast.node import Node
 from cmaj.parser.grammar import Grammar
@@ -24,9 +24,13 @@ def meta_table() -> ParseTable:
     return table_for(grammar, graph)
 
 
-def parse(lines: List[str], grammar: Grammar, table: ParseTable) -> Node:
-    from cmaj.lexical.scanner import scan
+def parse(lines: Iterable[str], grammar: Grammar, table: ParseTable) -> Node:
+    from cmaj.lexical.scanner import scan_iter
     from cmaj.meta.matchers import matchers
     from cmaj.parser.lr1 import parse
-    tokens = [token for token in scan(lines, matchers()) if token.key != 'space']
-    return parse(tokens, grammar, table)
+    return parse(scan_iter(lines, matchers()), grammar, table)
+
+
+def parse_file(filename: str, grammar: Grammar, table: ParseTable) -> Node:
+    from cmaj.utils.filereader import stream
+    return parse(stream(filename), grammar, table)
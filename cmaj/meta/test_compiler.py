@@ -0,0 +1,11 @@
+from unittest import TestCase
+
+
+class CompilerTest(TestCase):
+    def test_given_lines_then_same_grammar_as_compiled_ast(self) -> None:
+        from cmaj.meta.compiler import compile_grammar, compile_lines
+        from cmaj.meta.parser import meta_grammar, meta_table, parse
+        lines = ['# comment\n', 'X = Y "+" X | Y\n', '\n', 'Y = "y" | "(" X ")"\n']
+        expected = compile_grammar(parse(lines, meta_grammar(), meta_table()))
+        self.assertEqual(expected.rules, compile_lines(lines).rules)
+        self.assertEqual(4, len(expected))
@@ -0,0 +1,17 @@
+from unittest import TestCase
+
+
+class ParseFileTest(TestCase):
+    def test_given_def_file_then_same_ast_as_parsing_read_lines(self) -> None:
+        import os
+        from tempfile import TemporaryDirectory
+        from cmaj.meta.parser import meta_grammar, meta_table, parse, parse_file
+        from cmaj.utils.filereader import read, stream
+        lines = ['# comment\n', 'X = Y "+" X | Y\n', '\n', 'Y = "y" | "(" X ")"\n']
+        with TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'grammar.def')
+            with open(filename, 'w') as file:
+                file.writelines(lines)
+            self.assertEqual(lines, list(stream(filename)))
+            expected = parse(read(filename), meta_grammar(), meta_table())
+            self.assertEqual(expected, parse_file(filename, meta_grammar(), meta_table()))
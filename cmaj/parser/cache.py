@@ -0,0 +1,76 @@
+from cmaj.parser.grammar import Grammar
+from cmaj.parser.table import DenseTable
+
+BUILDER_VERSION = 1  # Bump whenever graph or table construction changes its output
+
+_MAGIC = b'CMAJ'
+_HEADER = '<4sI32sIII'  # magic, version, digest, rows, columns, symbol bytes
+
+
+class CacheError(Exception):
+    pass
+
+
+def grammar_digest(grammar: Grammar) -> bytes:
+    import sys
+    from hashlib import sha256
+    digest = sha256(f'{BUILDER_VERSION}\x1d{sys.byteorder}\x1d'.encode())
+    for rule in grammar.rules:
+        digest.update('\x1f'.join([rule.key, *rule.symbols]).encode() + b'\x1e')
+    return digest.digest()
+
+
+def save_table(filename: str, table: DenseTable, digest: bytes) -> None:
+    import os
+    import struct
+    from array import array
+    symbols = '\0'.join(table.symbols).encode()
+    padding = -(struct.calcsize(_HEADER) + len(symbols)) % 4
+    header = struct.pack(_HEADER, _MAGIC, BUILDER_VERSION, digest, table.num_rows, table.num_columns, len(symbols))
+    temp_filename = f'{filename}.{os.getpid()}.tmp'
+    with open(temp_filename, 'wb') as file:
+        file.write(header + symbols + padding * b'\0')
+        array('i', table.codes).tofile(file)
+    os.replace(temp_filename, filename)
+
+
+def load_table(filename: str, digest: bytes) -> DenseTable:
+    import mmap
+    import struct
+    with open(filename, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as error:
+            raise CacheError(f'Empty cache file: {filename!r}') from error
+
+    header_size = struct.calcsize(_HEADER)
+    if len(buffer) < header_size:
+        raise CacheError(f'Truncated cache file: {filename!r}')
+    magic, version, file_digest, num_rows, num_columns, symbols_size = struct.unpack_from(_HEADER, buffer)
+    if (magic, version, file_digest) != (_MAGIC, BUILDER_VERSION, digest):
+        raise CacheError(f'Stale cache file: {filename!r}')
+    symbols_end = header_size + symbols_size
+    codes_begin = symbols_end + -symbols_end % 4
+    if len(buffer) != codes_begin + 4 * num_rows * num_columns:
+        raise CacheError(f'Truncated cache file: {filename!r}')
+
+    symbols = buffer[header_size:symbols_end].decode().split('\0') if num_columns else []
+    codes = memoryview(buffer)[codes_begin:].cast('i')
+    return DenseTable(num_rows, symbols, codes)
+
+
+def cached_table(grammar: Grammar, directory: str) -> DenseTable:
+    import os
+    from cmaj.parser.graph import graph_for
+    from cmaj.parser.table import dense_table_for, table_for
+    digest = grammar_digest(grammar)
+    filename = os.path.join(directory, f'{digest.hex()}.table')
+    try:
+        return load_table(filename, digest)
+    except (FileNotFoundError, CacheError):
+        pass
+
+    table = dense_table_for(table_for(grammar, graph_for(grammar)))
+    os.makedirs(directory, exist_ok=True)
+    save_table(filename, table, digest)
+    return table
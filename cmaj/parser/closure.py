@@ -1,4 +1,4 @@
-from typing import AbstractSet, FrozenSet, List, Mapping
+from typing import AbstractSet, Dict, FrozenSet, List, Mapping, Optional
 
 from cmaj.parser.grammar import Grammar
 
@@ -83,37 +83,46 @@ def resolve(state: RuleState, grammar: Grammar) -> ResolvedRuleState:
 Closure = FrozenSet[RuleState]
 
 
-def closure_for(grammar: Grammar, *states: RuleState) -> Closure:
-    closure = _closure_for(grammar, set(states), set())
-    return _simplify_lookaheads(closure)
-
-
-def _closure_for(grammar: Grammar,
-                 states: AbstractSet[RuleState],
-                 visited: AbstractSet[RuleState]) -> FrozenSet[RuleState]:
-    new_states = frozenset.union(*(state.follow_states(grammar) for state in states)) - visited
-    if not new_states:
-        return frozenset(states)
-    return frozenset(states) | _closure_for(grammar, new_states, visited | new_states)
-
-
-def _simplify_lookaheads(closure: Closure) -> Closure:
-    from collections import defaultdict
-    from typing import Dict, Set, Tuple
-    simplified: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
-    for rule_state in closure:
-        simplified[(rule_state.rule_index, rule_state.num_processed)] |= rule_state.lookaheads
-    return frozenset({RuleState(rule_index, num_processed, lookaheads)
-                      for (rule_index, num_processed), lookaheads in simplified.items()})
-
-
-def successors_for(grammar: Grammar, closure: Closure) -> Mapping[str, Closure]:
+def closure_for(grammar: Grammar, *states: RuleState, cache: Optional[Dict[Closure, Closure]] = None) -> Closure:
+    kernel = frozenset(states)
+    if cache is not None and (closure := cache.get(kernel)) is not None:
+        return closure
+    closure = _closure_for(grammar, kernel)
+    if cache is not None:
+        cache[kernel] = closure
+    return closure
+
+
+def _closure_for(grammar: Grammar, kernel: Closure) -> Closure:
+    from typing import Set, Tuple
+    lookaheads: Dict[Tuple[int, int], Set[str]] = {}
+    for state in kernel:
+        lookaheads.setdefault((state.rule_index, state.num_processed), set()).update(state.lookaheads)
+
+    fringe = list(lookaheads)
+    while fringe:
+        rule_index, num_processed = item = fringe.pop()
+        symbols = grammar.rule_at(rule_index).symbols
+        if num_processed == len(symbols):
+            continue
+        follow_lookaheads = grammar.first(symbols[num_processed + 1:]) or lookaheads[item]
+        for follow_index in grammar.indexes_of(symbols[num_processed]):
+            follow_item = follow_index, 0
+            if not follow_lookaheads <= (target := lookaheads.setdefault(follow_item, set())):
+                target |= follow_lookaheads
+                fringe.append(follow_item)
+    return frozenset({RuleState(rule_index, num_processed, state_lookaheads)
+                      for (rule_index, num_processed), state_lookaheads in lookaheads.items()})
+
+
+def successors_for(grammar: Grammar, closure: Closure,
+                   cache: Optional[Dict[Closure, Closure]] = None) -> Mapping[str, Closure]:
     from collections import defaultdict
-    from typing import Dict, Set
+    from typing import Set
     groups: Dict[str, Set[RuleState]] = defaultdict(set)
     for state in closure:
         resolved = ResolvedRuleState(state, grammar)
         if not resolved.reducible:
             symbol = resolved.next_symbol
             groups[symbol].add(RuleState(state.rule_index, state.num_processed + 1, state.lookaheads))
-    return {key: closure_for(grammar, *value) for key, value in groups.items()}
+    return {key: closure_for(grammar, *value, cache=cache) for key, value in groups.items()}
@@ -0,0 +1,80 @@
+from typing import List
+
+from cmaj.parser.grammar import Grammar
+from cmaj.parser.table import ParseTable
+
+_TEMPLATE = '''\
+# Generated by cmaj.parser.codegen. Do not edit.
+from itertools import chain
+
+SHIFT = {shift}
+REDUCE = {reduce}
+ACCEPT = {accept}
+TAG_BITS = {tag_bits}
+TAG_MASK = {tag_mask}
+EOF = {eof!r}
+
+RULES = (
+{rules}
+)
+
+ACTIONS = (
+{actions}
+)
+
+GOTOS = (
+{gotos}
+)
+
+
+class ParserError(Exception):
+    pass
+
+
+def parse(tokens, build=lambda key, children: (key, children)):
+    rows = [0]
+    nodes = []
+    for token in chain(tokens, [None]):
+        key = EOF if token is None else token.key
+        while (tag := (code := ACTIONS[rows[-1]].get(key, 0)) & TAG_MASK) == REDUCE:
+            rule_key, length = RULES[code >> TAG_BITS]
+            node = build(rule_key, nodes[-length:])
+            del nodes[-length:]
+            del rows[-length:]
+            nodes.append(node)
+            rows.append(GOTOS[rows[-1]][rule_key])
+        if tag == SHIFT:
+            rows.append(code >> TAG_BITS)
+            nodes.append(token)
+        elif tag == ACCEPT:
+            break
+        else:
+            raise ParserError(f'Unexpected token: {{token!r}}')
+    return nodes[0]
+'''
+
+
+def generate_module(grammar: Grammar, table: ParseTable) -> str:
+    from cmaj.parser.table import Action, DenseTable
+    actions: List[str] = []
+    gotos: List[str] = []
+    for row in range(table.num_rows):
+        row_actions = {symbol: table.action(row, symbol) for symbol in table.symbols}
+        row_actions = {symbol: action for symbol, action in row_actions.items() if action is not None}
+        actions.append(repr({symbol: DenseTable.encode(action) for symbol, action in row_actions.items()
+                             if action.key != Action.GOTO}))
+        gotos.append(repr({symbol: action.index for symbol, action in row_actions.items()
+                           if action.key == Action.GOTO}))
+    rules = [repr((rule.key, len(rule.symbols))) for rule in grammar.rules]
+    return _TEMPLATE.format(shift=DenseTable.SHIFT, reduce=DenseTable.REDUCE, accept=DenseTable.ACCEPT,
+                            tag_bits=DenseTable.TAG_BITS, tag_mask=DenseTable.TAG_MASK, eof=Grammar.AUGMENTED_EOF,
+                            rules=_indent(rules), actions=_indent(actions), gotos=_indent(gotos))
+
+
+def write_module(filename: str, grammar: Grammar, table: ParseTable) -> None:
+    with open(filename, 'w') as file:
+        file.write(generate_module(grammar, table))
+
+
+def _indent(literals: List[str]) -> str:
+    return '\n'.join(f'    {literal},' for literal in literals)
@@ -1,4 +1,4 @@
-from typing import AbstractSet, FrozenSet, List
+from typing import FrozenSet, Iterable, List, Mapping, Optional, Tuple
 
 
 class Rule(object):
@@ -35,16 +35,35 @@ class Grammar(object):
 
     def __init__(self, *rules: Rule) -> None:
         from cmaj.utils.ordered_set import OrderedSet
+        from typing import Dict
         self._rules = OrderedSet(*rules)
+        self._first_sets: Optional[Mapping[str, FrozenSet[str]]] = None
+
+        indexes: Dict[str, List[int]] = {}
+        for index, rule in enumerate(self._rules):
+            indexes.setdefault(rule.key, []).append(index)
+        self._indexes: Mapping[str, Tuple[int, ...]] = {key: tuple(value) for key, value in indexes.items()}
+        rhs_symbols = {symbol: None for rule in self._rules for symbol in rule.symbols}
+        self._symbols: Tuple[str, ...] = tuple({**dict.fromkeys(self._indexes), **rhs_symbols})
+        self._symbol_ids: Mapping[str, int] = {symbol: index for index, symbol in enumerate(self._symbols)}
+        self._terminals: FrozenSet[str] = frozenset(rhs_symbols) - self._indexes.keys()
 
     def __len__(self) -> int:
         return len(self._rules)
 
     @property
     def symbols(self) -> List[str]:
-        lhs_symbols = {rule.key: None for rule in self._rules}
-        rhs_symbols = {symbol: None for rule in self._rules for symbol in rule.symbols}
-        return list({**lhs_symbols, **rhs_symbols})
+        return list(self._symbols)
+
+    @property
+    def terminals(self) -> FrozenSet[str]:
+        return self._terminals
+
+    def symbol_id(self, symbol: str) -> int:
+        return self._symbol_ids[symbol]
+
+    def symbol_at(self, symbol_id: int) -> str:
+        return self._symbols[symbol_id]
 
     def rule_at(self, index: int) -> Rule:
         return self._rules[index]
@@ -54,10 +73,10 @@ class Grammar(object):
         return list(self._rules)
 
     def rules_of(self, key: str) -> List[Rule]:
-        return [rule for rule in self._rules if rule.key == key]
+        return [self._rules[index] for index in self._indexes.get(key, ())]
 
     def indexes_of(self, key: str) -> List[int]:
-        return [index for index, rule in enumerate(self._rules) if rule.key == key]
+        return list(self._indexes.get(key, ()))
 
     @property
     def is_augmented(self) -> bool:
@@ -66,23 +85,42 @@ class Grammar(object):
         return self._rules[-1].key == self.AUGMENTED_START
 
     def is_terminal(self, symbol: str) -> bool:
-        return not self.rules_of(symbol)
+        return symbol not in self._indexes
 
     def first(self, symbols: List[str]) -> FrozenSet[str]:
         if not symbols:
             return frozenset()
-        return self._first(symbols, set())
-
-    def _first(self, symbols: List[str], visited: AbstractSet[str]) -> FrozenSet[str]:
-        if (symbol := symbols[0]) in visited:
-            return frozenset()
-        if self.is_terminal(symbol):
+        if self._first_sets is None:
+            self._first_sets = _first_sets(self._rules)
+        if (first_set := self._first_sets.get(symbol := symbols[0])) is None:
             return frozenset({symbol})
-        return frozenset.union(*(self._first(rule.symbols, visited | {symbol}) for rule in self.rules_of(symbol)))
+        return first_set
 
     def __repr__(self) -> str:
         from cmaj.utils.stringify import stringify
-        return stringify(self, use={'rules': [*self._rules]})
+        return stringify(self, use={'rules': [*self._rules]},
+                         hide={'first_sets', 'indexes', 'symbols', 'symbol_ids', 'terminals'})
+
+
+def _first_sets(rules: Iterable[Rule]) -> Mapping[str, FrozenSet[str]]:
+    from collections import deque
+    from typing import Dict, Set
+    first_sets: Dict[str, Set[str]] = {rule.key: set() for rule in rules}
+    dependents: Dict[str, Set[str]] = {key: set() for key in first_sets}
+    for rule in rules:
+        if (head := rule.symbols[0]) in first_sets:
+            dependents[head].add(rule.key)
+        else:
+            first_sets[rule.key].add(head)
+
+    fringe = deque(key for key, first_set in first_sets.items() if first_set)
+    while fringe:
+        key = fringe.popleft()
+        for dependent in dependents[key]:
+            if not first_sets[key] <= first_sets[dependent]:
+                first_sets[dependent] |= first_sets[key]
+                fringe.append(dependent)
+    return {key: frozenset(first_set) for key, first_set in first_sets.items()}
 
 
 def augment(grammar: Grammar, start: str) -> Grammar:
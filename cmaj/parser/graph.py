@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from cmaj.parser.closure import Closure, RuleState
 from cmaj.parser.grammar import Grammar
@@ -6,9 +6,8 @@ from cmaj.parser.grammar import Grammar
 
 class ClosureGraph(object):
     def __init__(self) -> None:
-        from typing import Dict
-        from cmaj.utils.ordered_set import OrderedSet
-        self._closures: OrderedSet[Closure] = OrderedSet()
+        self._closures: List[Closure] = []
+        self._indexes: Dict[Closure, int] = {}
         self._successors: List[Dict[str, int]] = []
 
     @property
@@ -23,45 +22,142 @@ class ClosureGraph(object):
     def num_edges(self) -> int:
         return sum(len(edges) for edges in self._successors)
 
+    def closure_at(self, index: int) -> Closure:
+        return self._closures[index]
+
     def index(self, closure: Closure) -> int:
-        return self._closures.index(closure)
+        return self._indexes[closure]
 
     def __contains__(self, closure: Closure) -> bool:
-        return closure in self._closures
+        return closure in self._indexes
 
-    def add_closure(self, closure: Closure) -> None:
-        if closure not in self:
-            self._closures |= {closure}
+    def add_closure(self, closure: Closure) -> int:
+        if (index := self._indexes.get(closure)) is None:
+            index = self._indexes[closure] = len(self._closures)
+            self._closures.append(closure)
             self._successors.append({})
+        return index
 
     def successor(self, source_index: int, symbol: str) -> int:
         return self._successors[source_index][symbol]
 
-    def add_edge(self, source: Closure, symbol: str, target: Closure) -> None:
-        self.add_closure(source)
-        self.add_closure(target)
+    def successors(self, source_index: int) -> Dict[str, int]:
+        return dict(self._successors[source_index])
 
-        source_index = self.index(source)
-        target_index = self.index(target)
+    def add_edge(self, source: Closure, symbol: str, target: Closure) -> None:
+        source_index = self.add_closure(source)
+        target_index = self.add_closure(target)
 
         assert symbol not in self._successors[source_index]
         self._successors[source_index][symbol] = target_index
 
     def __repr__(self) -> str:
         from cmaj.utils.stringify import stringify
-        return stringify(self, use={'closures': [*self._closures]})
+        return stringify(self, hide={'indexes'})
 
 
-def graph_for(grammar: Grammar) -> ClosureGraph:
+def graph_for(grammar: Grammar, mode: str = 'lr1') -> ClosureGraph:
+    from collections import deque
     from cmaj.parser.closure import closure_for, successors_for
+    if mode == 'lalr':
+        return _lalr_graph_for(grammar)
+    if mode != 'lr1':
+        raise ValueError(f'Unknown graph mode: {mode!r}')
+    cache: Dict[Closure, Closure] = {}
     graph = ClosureGraph()
-    fringe = {closure_for(grammar, RuleState.start(grammar))}
+    start = closure_for(grammar, RuleState.start(grammar))
+    graph.add_closure(start)
+    fringe = deque([start])
     while fringe:
-        source = fringe.pop()
-        graph.add_closure(source)
-
-        successors = successors_for(grammar, source)
-        fringe |= {target for target in successors.values() if target not in graph}
-        for symbol, target in successors.items():
+        source = fringe.popleft()
+        successors = successors_for(grammar, source, cache=cache)
+        for symbol in sorted(successors, key=grammar.symbol_id):
+            if (target := successors[symbol]) not in graph:
+                fringe.append(target)
             graph.add_edge(source, symbol, target)
     return graph
+
+
+def parallel_graph_for(grammar: Grammar, max_workers: Optional[int] = None, chunk_size: int = 16) -> ClosureGraph:
+    from concurrent.futures import ProcessPoolExecutor
+    from cmaj.parser.closure import closure_for
+    assert chunk_size > 0
+    graph = ClosureGraph()
+    start = closure_for(grammar, RuleState.start(grammar))
+    graph.add_closure(start)
+    wave = [start]
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(grammar,)) as executor:
+        while wave:
+            next_wave: List[Closure] = []
+            for source, successors in zip(wave, executor.map(_successors_of, wave, chunksize=chunk_size)):
+                for symbol, target in successors:
+                    if target not in graph:
+                        next_wave.append(target)
+                    graph.add_edge(source, symbol, target)
+            wave = next_wave
+    return graph
+
+
+_worker_grammar: Optional[Grammar] = None
+_worker_cache: Dict[Closure, Closure] = {}
+
+
+def _init_worker(grammar: Grammar) -> None:
+    global _worker_grammar
+    _worker_grammar = grammar
+    _worker_cache.clear()
+
+
+def _successors_of(closure: Closure) -> List[Tuple[str, Closure]]:
+    from cmaj.parser.closure import successors_for
+    successors = successors_for(_worker_grammar, closure, cache=_worker_cache)
+    return [(symbol, successors[symbol]) for symbol in sorted(successors, key=_worker_grammar.symbol_id)]
+
+
+def _lalr_graph_for(grammar: Grammar) -> ClosureGraph:
+    from collections import deque
+    from cmaj.parser.closure import closure_for, successors_for
+    cache: Dict[Closure, Closure] = {}
+    closures: List[Closure] = [closure_for(grammar, RuleState.start(grammar))]
+    edges: List[Dict[str, int]] = [{}]
+    indexes: Dict[FrozenSet[Tuple[int, int]], int] = {_core_of(closures[0]): 0}
+    fringe = deque([0])
+    queued = {0}
+    while fringe:
+        source_index = fringe.popleft()
+        queued.remove(source_index)
+        successors = successors_for(grammar, closures[source_index], cache=cache)
+        for symbol in sorted(successors, key=grammar.symbol_id):
+            target = successors[symbol]
+            if (target_index := indexes.get(core := _core_of(target))) is None:
+                target_index = indexes[core] = len(closures)
+                closures.append(target)
+                edges.append({})
+                changed = True
+            else:
+                merged = _merge(closures[target_index], target)
+                changed = merged != closures[target_index]
+                closures[target_index] = merged
+            edges[source_index][symbol] = target_index
+            if changed and target_index not in queued:
+                fringe.append(target_index)
+                queued.add(target_index)
+
+    graph = ClosureGraph()
+    for closure in closures:
+        graph.add_closure(closure)
+    for source_index, targets in enumerate(edges):
+        for symbol, target_index in targets.items():
+            graph.add_edge(closures[source_index], symbol, closures[target_index])
+    return graph
+
+
+def _core_of(closure: Closure) -> FrozenSet[Tuple[int, int]]:
+    return frozenset((state.rule_index, state.num_processed) for state in closure)
+
+
+def _merge(closure: Closure, other: Closure) -> Closure:
+    lookaheads = {(state.rule_index, state.num_processed): state.lookaheads for state in closure}
+    return frozenset(RuleState(state.rule_index, state.num_processed,
+                               lookaheads[(state.rule_index, state.num_processed)] | state.lookaheads)
+                     for state in other)
@@ -1,75 +1,274 @@
-from typing import List, Tuple
+from typing import AbstractSet, Any, Callable, Iterable, List, Mapping, Optional, Tuple, Union
 
 from cmaj.ast.node import Node
 from cmaj.parser.grammar import Grammar, Rule
-from cmaj.parser.table import ParseTable
+from cmaj.parser.table import CompressedTable, DenseTable, ParseTable
 
 
 class ParserError(Exception):
     pass
 
 
-Stack = List[Tuple[int, Node]]
+Table = Union[ParseTable, DenseTable, CompressedTable]
+Callback = Callable[[List[Any]], Any]
 
 
-def parse(tokens: List[Node], grammar: Grammar, table: ParseTable) -> Node:
-    from cmaj.parser.table import Action
-    assert table.num_rows > 0
-    stack: Stack = []
-    row = 0
-    tokens = tokens + [Node(Grammar.AUGMENTED_EOF)]
-    token_index = 0
-    while True:
-        token = tokens[token_index]
-        action = table.action(row, token.key)
+class Parser(object):
+    def __init__(self, grammar: Grammar, table: Table, validate: bool = True,
+                 callbacks: Optional[Mapping[Rule, Callback]] = None, default: Optional[Callback] = None,
+                 shift: Optional[Callable[[Node], Any]] = None) -> None:
+        assert table.num_rows > 0
+        rules = grammar.rules
+        self._table = table
+        self._validate = validate
+        self._columns = frozenset(table.symbols)
+        self._rules = rules if validate and callbacks is None else None
+        self._rule_keys = [rule.key for rule in rules]
+        self._rule_lengths = [len(rule.symbols) for rule in rules]
+        self._callbacks = _callbacks_for(grammar, callbacks, default)
+        self._shift = shift
+        self._rows = [0]
+        self._values: List[Any] = []
+        self._viable = True
+        self._accepted = False
+
+    @property
+    def viable(self) -> bool:
+        return self._viable
+
+    @property
+    def accepted(self) -> bool:
+        return self._accepted
+
+    def feed(self, token: Node) -> None:
+        if not self._viable or self._accepted:
+            raise ParserError(f'Unable to feed token after parsing stopped: {token!r}')
+        try:
+            self._feed(token)
+        except ParserError:
+            self._viable = False
+            raise
+
+    def finish(self) -> Any:
+        self.feed(Node(Grammar.AUGMENTED_EOF))
+        if len(self._values) != 1:
+            self._viable = False
+            raise ParserError(f'Found unprocessed tokens: {self._values!r}')
+        self._accepted = True
+        return self._values[0]
+
+    def recover(self, symbol: str) -> bool:
+        if symbol not in self._columns:
+            return False
+        for depth in reversed(range(len(self._rows))):
+            if self._table.action(self._rows[depth], symbol) is not None:
+                del self._rows[depth + 1:]
+                del self._values[depth:]
+                self._viable = True
+                return True
+        return False
+
+    def _feed(self, token: Node) -> None:
+        from cmaj.parser.table import Action
+        table, rows, values = self._table, self._rows, self._values
+        if token.key not in self._columns:
+            raise ParserError(f'Unexpected token: {token!r}')
+        while (action := table.action(rows[-1], token.key)) is not None and action.key == Action.REDUCE:
+            rule_index = action.index
+            if self._rules is not None:
+                _validate_reduction(values, self._rules[rule_index])
+            _reduce(values, rows, self._callbacks[rule_index], self._rule_lengths[rule_index])
+            goto = table.action(rows[-1], key := self._rule_keys[rule_index])
+            if self._validate and (goto is None or goto.key != Action.GOTO):
+                raise ParserError(f'Unexpected parser action {goto!r} for reduction to {key!r}')
+            rows.append(goto.index)
         if action is None:
-            raise ParserError(f'Unexpected token: {tokens[token_index]!r}')
-        elif action.key == Action.ACCEPT:
-            break
+            raise ParserError(f'Unexpected token: {token!r}')
         elif action.key == Action.SHIFT:
-            stack.append((row, tokens[token_index]))
-            row = action.index
-            token_index += 1
-        elif action.key == Action.GOTO:
-            row = action.index
-        elif action.key == Action.REDUCE:
-            rule_index = action.index
-            rule = grammar.rule_at(rule_index)
+            rows.append(action.index)
+            values.append(token if self._shift is None else self._shift(token))
+        elif action.key != Action.ACCEPT or token.key != Grammar.AUGMENTED_EOF:
+            raise ParserError(f'Unexpected parser action {action!r} for token: {token!r}')
 
-            stack, row, nodes = _reduce_stack(stack, rule)
-            node = _reduce_nodes(nodes, rule)
-            stack.append((row, node))
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, use={'depth': len(self._values)},
+                         hide={'table', 'validate', 'columns', 'rules', 'rule_keys', 'rule_lengths', 'callbacks',
+                               'shift', 'rows', 'values'})
 
-            action = table.action(row, node.key)
-            assert action.key == Action.GOTO
-            row = action.index
-        else:
-            raise ParserError(f'Unexpected parser action {action!r} for token: {tokens[token_index]!r}')
 
-    if len(stack) != 1:
-        raise ParserError(f'Found unprocessed tokens: {_to_symbols(stack)!r}')
-    return stack[0][1]
+class Diagnostic(object):
+    def __init__(self, position: int, token: Node, message: str) -> None:
+        self._position = position
+        self._token = token
+        self._message = message
 
+    @property
+    def position(self) -> int:
+        return self._position
 
-def _reduce_stack(stack: Stack, rule: Rule) -> Tuple[Stack, int, List[Node]]:
-    num_symbols = len(rule.symbols)
-    if num_symbols > len(stack):
-        raise ParserError(f'Unable to apply rule {rule!r}. Too few tokens: {_to_symbols(stack)!r}')
+    @property
+    def token(self) -> Node:
+        return self._token
 
-    stack_tail, stack_head = stack[:-num_symbols], stack[-num_symbols:]
-    row = stack_head[0][0]
-    nodes = [node for _, node in stack_head]
-    return stack_tail, row, nodes
+    @property
+    def message(self) -> str:
+        return self._message
 
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self)
 
-def _reduce_nodes(nodes: List[Node], rule: Rule) -> Node:
-    node = Node(rule.key)
-    for symbol, child in zip(rule.symbols, nodes):
-        if symbol != child.key:
-            raise ParserError(f'Unable to apply rule {rule!r}. Unexpected token: {child!r}')
-        node.add_child(child)
+
+def parse(tokens: Iterable[Node], grammar: Grammar, table: Table, validate: bool = True) -> Node:
+    if isinstance(table, (DenseTable, CompressedTable)):
+        assert table.num_rows > 0
+        return _parse_codes(tokens, grammar, table, validate, _callbacks_for(grammar), None)
+    parser = Parser(grammar, table, validate)
+    for token in tokens:
+        parser.feed(token)
+    return parser.finish()
+
+
+def evaluate(tokens: Iterable[Node], grammar: Grammar, table: Table, callbacks: Mapping[Rule, Callback],
+             default: Optional[Callback] = None, shift: Optional[Callable[[Node], Any]] = None) -> Any:
+    if isinstance(table, (DenseTable, CompressedTable)):
+        assert table.num_rows > 0
+        return _parse_codes(tokens, grammar, table, False, _callbacks_for(grammar, callbacks, default), shift)
+    parser = Parser(grammar, table, callbacks=callbacks, default=default, shift=shift)
+    for token in tokens:
+        parser.feed(token)
+    return parser.finish()
+
+
+def parse_with_recovery(tokens: Iterable[Node], grammar: Grammar, table: Table,
+                        sync: AbstractSet[str]) -> Tuple[Optional[Node], List[Diagnostic]]:
+    parser = Parser(grammar, table)
+    diagnostics: List[Diagnostic] = []
+    position = -1
+    for position, token in enumerate(tokens):
+        if not parser.viable and (token.key not in sync or not parser.recover(token.key)):
+            continue
+        if (error := _try(parser.feed, token)) is None:
+            continue
+        diagnostics.append(Diagnostic(position, token, str(error)))
+        if token.key in sync and parser.recover(token.key):
+            _try(parser.feed, token)
+
+    eof = Node(Grammar.AUGMENTED_EOF)
+    for _ in range(2):
+        if not parser.viable and not parser.recover(eof.key):
+            break
+        try:
+            return parser.finish(), diagnostics
+        except ParserError as error:
+            diagnostics.append(Diagnostic(position + 1, eof, str(error)))
+    return None, diagnostics
+
+
+def _try(feed: Callable[[Node], None], token: Node) -> Optional[ParserError]:
+    try:
+        feed(token)
+    except ParserError as error:
+        return error
+    return None
+
+
+def recognize(tokens: Iterable[Node], grammar: Grammar, table: Table) -> Optional[int]:
+    from itertools import chain
+    assert table.num_rows > 0
+    shift_tag, reduce_tag, accept_tag = DenseTable.SHIFT, DenseTable.REDUCE, DenseTable.ACCEPT
+    tag_bits, tag_mask = DenseTable.TAG_BITS, DenseTable.TAG_MASK
+    symbols = table.symbols
+    columns = {symbol: column for column, symbol in enumerate(symbols)}
+    if isinstance(table, ParseTable):
+        def code_at(row: int, column: int) -> int:
+            return DenseTable.encode(table.action(row, symbols[column]))
+    else:
+        code_at = table.code
+    rule_lengths = [len(rule.symbols) for rule in grammar.rules]
+    rule_columns = [columns.get(rule.key, -1) for rule in grammar.rules]
+
+    rows = [0]
+    for position, key in enumerate(chain((token.key for token in tokens), [Grammar.AUGMENTED_EOF])):
+        if (column := columns.get(key)) is None:
+            return position
+        while (tag := (code := code_at(rows[-1], column)) & tag_mask) == reduce_tag:
+            rule_index = code >> tag_bits
+            del rows[-rule_lengths[rule_index]:]
+            rows.append(code_at(rows[-1], rule_columns[rule_index]) >> tag_bits)
+        if tag == accept_tag:
+            return None
+        if tag != shift_tag:
+            return position
+        rows.append(code >> tag_bits)
+    raise AssertionError('End of input is always accepted or rejected')
+
+
+def _parse_codes(tokens: Iterable[Node], grammar: Grammar, table: Union[DenseTable, CompressedTable],
+                 validate: bool, callbacks: List[Callback], shift: Optional[Callable[[Node], Any]]) -> Any:
+    from itertools import chain
+    shift_tag, reduce_tag, accept_tag = DenseTable.SHIFT, DenseTable.REDUCE, DenseTable.ACCEPT
+    tag_bits, tag_mask = DenseTable.TAG_BITS, DenseTable.TAG_MASK
+    code_at = table.code
+    columns = {symbol: table.column(symbol) for symbol in table.symbols}
+    rules = grammar.rules
+    rule_lengths = [len(rule.symbols) for rule in rules]
+    rule_columns = [columns.get(rule.key, -1) for rule in rules]
+
+    rows = [0]
+    values: List[Any] = []
+    for token in chain(tokens, [Node(Grammar.AUGMENTED_EOF)]):
+        if (column := columns.get(token.key)) is None:
+            raise ParserError(f'Unexpected token: {token!r}')
+        while (tag := (code := code_at(rows[-1], column)) & tag_mask) == reduce_tag:
+            rule_index = code >> tag_bits
+            if validate:
+                _validate_reduction(values, rules[rule_index])
+            _reduce(values, rows, callbacks[rule_index], rule_lengths[rule_index])
+            rows.append(code_at(rows[-1], rule_columns[rule_index]) >> tag_bits)
+        if tag == shift_tag:
+            rows.append(code >> tag_bits)
+            values.append(token if shift is None else shift(token))
+        elif tag == accept_tag:
+            break
+        else:
+            raise ParserError(f'Unexpected token: {token!r}')
+
+    if len(values) != 1:
+        raise ParserError(f'Found unprocessed tokens: {values!r}')
+    return values[0]
+
+
+def _callbacks_for(grammar: Grammar, callbacks: Optional[Mapping[Rule, Callback]] = None,
+                   default: Optional[Callback] = None) -> List[Callback]:
+    from functools import partial
+    if callbacks is None:
+        return [partial(_build_node, rule.key) for rule in grammar.rules]
+    missing = [rule for rule in grammar.rules
+               if rule not in callbacks and default is None and rule.key != Grammar.AUGMENTED_START]
+    if missing:
+        raise ValueError(f'Missing reduce callbacks for rules: {missing!r}')
+    return [callbacks.get(rule, default) for rule in grammar.rules]
+
+
+def _build_node(key: str, children: List[Node]) -> Node:
+    node = Node(key)
+    node.add_children(*children)
     return node
 
 
-def _to_symbols(stack: Stack) -> List[str]:
-    return [node.key for _, node in stack]
+def _reduce(values: List[Any], rows: List[int], callback: Callback, length: int) -> None:
+    value = callback(values[-length:])
+    del values[-length:]
+    del rows[-length:]
+    values.append(value)
+
+
+def _validate_reduction(nodes: List[Node], rule: Rule) -> None:
+    symbols = rule.symbols
+    if len(symbols) > len(nodes):
+        raise ParserError(f'Unable to apply rule {rule!r}. Too few tokens: {[node.key for node in nodes]!r}')
+    for symbol, child in zip(symbols, nodes[-len(symbols):]):
+        if symbol != child.key:
+            raise ParserError(f'Unable to apply rule {rule!r}. Unexpected token: {child!r}')
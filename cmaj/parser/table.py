@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from cmaj.parser.grammar import Grammar
 from cmaj.parser.graph import ClosureGraph
@@ -65,6 +65,10 @@ class ParseTable(object):
     def num_columns(self) -> int:
         return len(self._table)
 
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._table)
+
     def action(self, row: int, column: str) -> Action:
         return self._table[column][row]
 
@@ -80,6 +84,162 @@ class ParseTable(object):
         return stringify(self)
 
 
+class DenseTable(object):
+    SHIFT = 1
+    GOTO = 2
+    REDUCE = 3
+    ACCEPT = 4
+    TAG_BITS = 3
+    TAG_MASK = (1 << TAG_BITS) - 1
+
+    _TAGS = {Action.SHIFT: SHIFT, Action.GOTO: GOTO, Action.REDUCE: REDUCE, Action.ACCEPT: ACCEPT}
+    _KEYS = {tag: key for key, tag in _TAGS.items()}
+
+    @staticmethod
+    def encode(action: Optional[Action]) -> int:
+        if action is None:
+            return 0
+        return action.index << DenseTable.TAG_BITS | DenseTable._TAGS[action.key]
+
+    @staticmethod
+    def decode(code: int) -> Optional[Action]:
+        if code == 0:
+            return None
+        return Action(DenseTable._KEYS[code & DenseTable.TAG_MASK], code >> DenseTable.TAG_BITS)
+
+    def __init__(self, num_rows: int, symbols: List[str], codes: Optional[Sequence[int]] = None) -> None:
+        from array import array
+        self._num_rows = num_rows
+        self._symbols = list(symbols)
+        self._columns = {symbol: column for column, symbol in enumerate(self._symbols)}
+        self._codes = array('i', bytes(4 * num_rows * len(symbols))) if codes is None else codes
+        assert len(self._codes) == num_rows * len(symbols)
+
+    @property
+    def num_rows(self) -> int:
+        return self._num_rows
+
+    @property
+    def num_columns(self) -> int:
+        return len(self._symbols)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    @property
+    def codes(self) -> Sequence[int]:
+        return self._codes
+
+    def column(self, symbol: str) -> int:
+        return self._columns[symbol]
+
+    def code(self, row: int, column: int) -> int:
+        return self._codes[row * len(self._symbols) + column]
+
+    def set_code(self, row: int, column: int, code: int) -> None:
+        self._codes[row * len(self._symbols) + column] = code
+
+    def action(self, row: int, column: str) -> Optional[Action]:
+        return self.decode(self.code(row, self._columns[column]))
+
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, hide={'columns', 'codes'})
+
+
+def dense_table_for(table: ParseTable) -> DenseTable:
+    dense_table = DenseTable(table.num_rows, table.symbols)
+    for column, symbol in enumerate(table.symbols):
+        for row in range(table.num_rows):
+            dense_table.set_code(row, column, DenseTable.encode(table.action(row, symbol)))
+    return dense_table
+
+
+class CompressedTable(object):
+    def __init__(self, num_rows: int, symbols: List[str], row_map: Sequence[int], bases: Sequence[int],
+                 defaults: Sequence[int], checks: Sequence[int], values: Sequence[int]) -> None:
+        assert len(row_map) == num_rows
+        assert len(bases) == len(defaults)
+        assert len(checks) == len(values)
+        self._num_rows = num_rows
+        self._symbols = list(symbols)
+        self._columns = {symbol: column for column, symbol in enumerate(self._symbols)}
+        self._row_map = row_map
+        self._bases = bases
+        self._defaults = defaults
+        self._checks = checks
+        self._values = values
+
+    @property
+    def num_rows(self) -> int:
+        return self._num_rows
+
+    @property
+    def num_columns(self) -> int:
+        return len(self._symbols)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    @property
+    def num_cells(self) -> int:
+        return len(self._row_map) + len(self._bases) + len(self._defaults) + len(self._checks) + len(self._values)
+
+    @property
+    def compression_ratio(self) -> float:
+        return self._num_rows * len(self._symbols) / max(self.num_cells, 1)
+
+    def column(self, symbol: str) -> int:
+        return self._columns[symbol]
+
+    def code(self, row: int, column: int) -> int:
+        row = self._row_map[row]
+        index = self._bases[row] + column
+        return self._values[index] if self._checks[index] == row else self._defaults[row]
+
+    def action(self, row: int, column: str) -> Optional[Action]:
+        return DenseTable.decode(self.code(row, self._columns[column]))
+
+    def __repr__(self) -> str:
+        from cmaj.utils.stringify import stringify
+        return stringify(self, use={'compression_ratio': self.compression_ratio},
+                         hide={'columns', 'row_map', 'bases', 'defaults', 'checks', 'values'})
+
+
+def compressed_table_for(table: DenseTable) -> CompressedTable:
+    from array import array
+    from collections import Counter
+    from typing import Dict
+    num_columns = table.num_columns
+    row_map = array('i')
+    unique_rows: Dict[Tuple[int, Tuple[Tuple[int, int], ...]], int] = {}
+    for row in range(table.num_rows):
+        codes = [table.code(row, column) for column in range(num_columns)]
+        reductions = Counter(code for code in codes if code & DenseTable.TAG_MASK == DenseTable.REDUCE)
+        default = reductions.most_common(1)[0][0] if reductions else 0
+        entries = tuple((column, code) for column, code in enumerate(codes) if code not in (0, default))
+        row_map.append(unique_rows.setdefault((default, entries), len(unique_rows)))
+
+    bases = array('i', bytes(4 * len(unique_rows)))
+    defaults = array('i', (default for default, _ in unique_rows))
+    checks = array('i', num_columns * [-1])
+    values = array('i', num_columns * [0])
+    for (_, entries), unique_row in sorted(unique_rows.items(), key=lambda item: -len(item[0][1])):
+        base = 0
+        while any(checks[base + column] != -1 for column, _ in entries):
+            base += 1
+            if len(checks) < base + num_columns:
+                checks.append(-1)
+                values.append(0)
+        for column, code in entries:
+            checks[base + column] = unique_row
+            values[base + column] = code
+        bases[unique_row] = base
+    return CompressedTable(table.num_rows, table.symbols, row_map, bases, defaults, checks, values)
+
+
 def table_for(grammar: Grammar, graph: ClosureGraph) -> ParseTable:
     from cmaj.parser.closure import resolve
     table = ParseTable(graph.num_closures, grammar.symbols)
@@ -96,3 +256,18 @@ def table_for(grammar: Grammar, graph: ClosureGraph) -> ParseTable:
         else:
             table.set_action(row, column, Action.goto(graph.successor(row, column)))
     return table
+
+
+def reduce_conflicts(grammar: Grammar, graph: ClosureGraph) -> List[Tuple[int, str, List[int]]]:
+    from typing import Dict
+    from cmaj.parser.closure import resolve
+    conflicts: List[Tuple[int, str, List[int]]] = []
+    for row, closure in enumerate(graph.closures):
+        reductions: Dict[str, List[int]] = {}
+        for state in sorted(closure, key=lambda s: s.rule_index):
+            if resolve(state, grammar).reducible:
+                for column in state.lookaheads:
+                    reductions.setdefault(column, []).append(state.rule_index)
+        conflicts += [(row, column, rule_indexes) for column, rule_indexes in sorted(reductions.items())
+                      if len(rule_indexes) > 1]
+    return conflicts
@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from cmaj.parser.grammar import Grammar, Rule, augment
+
+
+class CacheTest(TestCase):
+    def setUp(self) -> None:
+        from tempfile import TemporaryDirectory
+        self._directory = TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def test_given_same_rules_then_same_digest(self) -> None:
+        from cmaj.parser.cache import grammar_digest
+        first = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['a'])), 'S')
+        second = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['a'])), 'S')
+        other = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['b'])), 'S')
+        self.assertEqual(grammar_digest(first), grammar_digest(second))
+        self.assertNotEqual(grammar_digest(first), grammar_digest(other))
+
+    def test_given_cached_table_then_loaded_table_has_same_actions(self) -> None:
+        import os
+        from cmaj.meta.parser import meta_grammar, meta_table
+        from cmaj.parser.cache import cached_table
+        from cmaj.parser.table import dense_table_for
+        expected = dense_table_for(meta_table())
+        built = cached_table(meta_grammar(), self._directory.name)
+        self.assertEqual(1, len(os.listdir(self._directory.name)))
+        loaded = cached_table(meta_grammar(), self._directory.name)
+        self.assertIsInstance(loaded.codes, memoryview)
+        for table in [built, loaded]:
+            self.assertEqual(expected.symbols, table.symbols)
+            self.assertEqual(list(expected.codes), list(table.codes))
+
+    def test_given_loaded_table_then_parse_succeeds(self) -> None:
+        from cmaj.meta.parser import meta_grammar, parse
+        from cmaj.parser.cache import cached_table
+        cached_table(meta_grammar(), self._directory.name)
+        table = cached_table(meta_grammar(), self._directory.name)
+        self.assertEqual('GRAMMAR', parse(['X = "a" Y\n'], meta_grammar(), table).key)
+
+    def test_given_stale_or_truncated_file_then_rebuilt(self) -> None:
+        import os
+        from cmaj.parser.cache import CacheError, cached_table, grammar_digest, load_table
+        grammar = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['a', 'X']), Rule('X', ['b'])), 'S')
+        filename = os.path.join(self._directory.name, f'{grammar_digest(grammar).hex()}.table')
+        expected = list(cached_table(grammar, self._directory.name).codes)
+        with open(filename, 'r+b') as file:
+            file.truncate(os.path.getsize(filename) - 4)
+        self.assertRaises(CacheError, load_table, filename, grammar_digest(grammar))
+        self.assertEqual(expected, list(cached_table(grammar, self._directory.name).codes))
+        self.assertRaises(CacheError, load_table, filename, bytes(32))
@@ -126,3 +126,18 @@ class ClosureTest(TestCase):
                     RuleState(2, 0, {'x', 'y', 'b', 'a'}), RuleState(3, 0, {'x', 'y', 'b', 'a'}),
                     RuleState(0, 0, {'b', 'a'}), RuleState(1, 0, {'b', 'a'})}
         self.assertEqual(expected, result)
+
+    def test_given_deep_chain_of_references_then_complete_closure(self) -> None:
+        import sys
+        depth = 2 * sys.getrecursionlimit()
+        rules = [Rule(f'A{index}', [f'A{index + 1}', 'a']) for index in range(depth)] + [Rule(f'A{depth}', ['a'])]
+        result = closure_for(Grammar(*rules), RuleState(0, 0, {'$'}))
+        self.assertEqual(depth + 1, len(result))
+        self.assertIn(RuleState(depth, 0, {'a'}), result)
+
+    def test_given_cache_then_closure_of_kernel_computed_once(self) -> None:
+        grammar = Grammar(Rule('A', ['x', 'B']), Rule('B', ['C']), Rule('C', ['x']))
+        cache = {}
+        result = closure_for(grammar, RuleState(0, 1, {'$'}), cache=cache)
+        self.assertEqual({frozenset({RuleState(0, 1, {'$'})}): result}, cache)
+        self.assertIs(result, closure_for(grammar, RuleState(0, 1, {'$'}), cache=cache))
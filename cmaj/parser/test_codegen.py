@@ -0,0 +1,42 @@
+from types import ModuleType
+from unittest import TestCase
+
+from cmaj.ast.node import Node
+
+
+def load_module(source: str) -> ModuleType:
+    module = ModuleType('generated_parser')
+    exec(compile(source, '<generated>', 'exec'), module.__dict__)
+    return module
+
+
+def build(key: str, children: list) -> Node:
+    node = Node(key)
+    node.add_children(*children)
+    return node
+
+
+class CodegenTest(TestCase):
+    def test_given_meta_grammar_then_module_without_cmaj_imports(self) -> None:
+        from cmaj.meta.parser import meta_grammar, meta_table
+        from cmaj.parser.codegen import generate_module
+        source = generate_module(meta_grammar(), meta_table())
+        self.assertNotIn('cmaj', source.replace('# Generated by cmaj', ''))
+        self.assertEqual(meta_table().num_rows, len(load_module(source).ACTIONS))
+
+    def test_given_generated_module_then_same_ast_as_parse(self) -> None:
+        from cmaj.lexical.scanner import scan
+        from cmaj.meta.matchers import matchers
+        from cmaj.meta.parser import meta_grammar, meta_table, parse
+        from cmaj.parser.codegen import generate_module
+        module = load_module(generate_module(meta_grammar(), meta_table()))
+        lines = ['# comment\n', 'X = Y "+" X | Y\n', '\n', 'Y = "y"\n']
+        ast = module.parse(scan(lines, matchers()), build=build)
+        self.assertEqual(parse(lines, meta_grammar(), meta_table()), ast)
+
+    def test_given_unexpected_token_then_generated_error(self) -> None:
+        from cmaj.meta.parser import meta_grammar, meta_table
+        from cmaj.parser.codegen import generate_module
+        module = load_module(generate_module(meta_grammar(), meta_table()))
+        self.assertEqual('GRAMMAR', module.parse([Node('eol')])[0])
+        self.assertRaises(module.ParserError, module.parse, [Node('identifier'), Node('eol')])
@@ -54,6 +54,25 @@ class SymbolsTest(TestCase):
         self.assertEqual(['X', 'A', 'B', 'a', 'b', 'x'], grammar.symbols)
 
 
+class IndexTest(TestCase):
+    def test_given_rules_then_indexes_of_key_in_order(self) -> None:
+        grammar = Grammar(Rule('A', ['a']), Rule('B', ['b']), Rule('A', ['A', 'B']))
+        self.assertEqual([0, 2], grammar.indexes_of('A'))
+        self.assertEqual([Rule('A', ['a']), Rule('A', ['A', 'B'])], grammar.rules_of('A'))
+        self.assertEqual([], grammar.indexes_of('a'))
+
+    def test_given_rules_then_terminals_are_symbols_without_rules(self) -> None:
+        grammar = Grammar(Rule('A', ['a', 'B']), Rule('B', ['b']))
+        self.assertEqual({'a', 'b'}, grammar.terminals)
+        self.assertTrue(grammar.is_terminal('a'))
+        self.assertFalse(grammar.is_terminal('B'))
+
+    def test_given_symbols_then_ids_in_order_of_symbols(self) -> None:
+        grammar = Grammar(Rule('X', ['B', 'A', 'X']), Rule('A', ['a']), Rule('B', ['b']))
+        self.assertEqual(list(range(len(grammar.symbols))), [grammar.symbol_id(symbol) for symbol in grammar.symbols])
+        self.assertEqual(grammar.symbols, [grammar.symbol_at(index) for index in range(len(grammar.symbols))])
+
+
 class FirstTest(TestCase):
     def test_given_empty_list_then_empty(self) -> None:
         grammar = Grammar()
@@ -85,6 +104,13 @@ class FirstTest(TestCase):
         first_set = grammar.first(['A'])
         self.assertEqual({'a', 'b'}, first_set)
 
+    def test_given_chain_of_references_then_terminals_propagate_to_all_references(self) -> None:
+        grammar = Grammar(Rule('A', ['B', 'a']), Rule('B', ['C', 'b']), Rule('C', ['A', 'c']),
+                          Rule('C', ['c']), Rule('B', ['b']))
+        self.assertEqual({'b', 'c'}, grammar.first(['A']))
+        self.assertEqual({'b', 'c'}, grammar.first(['B', 'x']))
+        self.assertEqual({'b', 'c'}, grammar.first(['C']))
+
 
 class AugmentTest(TestCase):
     def test_given_start_is_terminal_when_augment_then_error(self) -> None:
@@ -71,6 +71,14 @@ class ClosureGraphTest(TestCase):
              (4, 'B', 6), (4, 'C', 7), (4, '0', 4)]
         self._given_grammar_then_correct_graph(grammar, 'A', v, e)
 
+    def test_given_grammar_then_states_numbered_breadth_first_in_symbol_order(self) -> None:
+        from cmaj.parser.grammar import augment
+        grammar = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['a', 'X']), Rule('X', ['b'])), 'S')
+        graph = graph_for(grammar)
+        self.assertEqual({'S': 1, 'X': 2, 'a': 3, 'b': 4}, graph.successors(0))
+        self.assertEqual({'X': 5, 'a': 6, 'b': 7}, graph.successors(2))
+        self.assertEqual(graph.closures, graph_for(grammar).closures)
+
     def _given_grammar_then_correct_graph(self, grammar: Grammar, start: str,
                                           expected_closures: List[Closure],
                                           expected_edges: List[Tuple[int, str, int]]) -> None:
@@ -88,3 +96,57 @@ class ClosureGraphTest(TestCase):
             source = actual_graph.index(expected_closures[i])
             target = actual_graph.index(expected_closures[j])
             self.assertEqual(target, actual_graph.successor(source, symbol))
+
+
+class LalrGraphTest(TestCase):
+    def test_given_unknown_mode_then_error(self) -> None:
+        from cmaj.parser.grammar import augment
+        grammar = augment(Grammar(Rule('S', ['s'])), 'S')
+        self.assertRaises(ValueError, graph_for, grammar, mode='slr')
+
+    def test_given_slr_grammar_then_states_with_equal_cores_are_merged(self) -> None:
+        from cmaj.parser.grammar import augment
+        from cmaj.testing.closure import closure
+        grammar = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['a', 'X']), Rule('X', ['b'])), 'S')
+        graph = graph_for(grammar, mode='lalr')
+        self.assertEqual(7, graph.num_closures)
+        self.assertIn(closure((1, 1, 'ab$'), (1, 0, 'ab$'), (2, 0, 'ab$')), graph.closures)
+        self.assertIn(closure((2, 1, 'ab$')), graph.closures)
+        self.assertIn(closure((1, 2, 'ab$')), graph.closures)
+
+    def test_given_lalr_grammar_then_same_parse_trees_as_lr1(self) -> None:
+        from cmaj.parser.grammar import augment
+        from cmaj.parser.lr1 import parse
+        from cmaj.parser.table import table_for
+        from cmaj.parser.test_lr1 import tokens
+        grammar = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['a', 'X']), Rule('X', ['b'])), 'S')
+        lr1_table = table_for(grammar, graph_for(grammar))
+        lalr_table = table_for(grammar, graph_for(grammar, mode='lalr'))
+        self.assertLess(lalr_table.num_rows, lr1_table.num_rows)
+        for keys in ['bb', 'aabab', 'baab']:
+            self.assertEqual(parse(tokens(keys), grammar, lr1_table), parse(tokens(keys), grammar, lalr_table))
+
+    def test_given_lr1_grammar_which_is_not_lalr_then_reduce_conflicts(self) -> None:
+        from cmaj.parser.grammar import augment
+        from cmaj.parser.table import ConflictError, reduce_conflicts, table_for
+        grammar = augment(Grammar(Rule('S', ['a', 'E', 'c']), Rule('S', ['a', 'F', 'd']),
+                                  Rule('S', ['b', 'F', 'c']), Rule('S', ['b', 'E', 'd']),
+                                  Rule('E', ['e']), Rule('F', ['e'])), 'S')
+        lr1_graph = graph_for(grammar)
+        lalr_graph = graph_for(grammar, mode='lalr')
+        self.assertEqual([], reduce_conflicts(grammar, lr1_graph))
+        conflicts = reduce_conflicts(grammar, lalr_graph)
+        self.assertEqual([('c', [4, 5]), ('d', [4, 5])], [(column, rules) for _, column, rules in conflicts])
+        self.assertRaises(ConflictError, table_for, grammar, lalr_graph)
+
+
+class ParallelGraphTest(TestCase):
+    def test_given_meta_grammar_then_same_graph_as_sequential(self) -> None:
+        from cmaj.meta.parser import meta_grammar
+        from cmaj.parser.graph import parallel_graph_for
+        grammar = meta_grammar()
+        expected = graph_for(grammar)
+        actual = parallel_graph_for(grammar, max_workers=2, chunk_size=1)
+        self.assertEqual(expected.closures, actual.closures)
+        for index in range(expected.num_closures):
+            self.assertEqual(expected.successors(index), actual.successors(index))
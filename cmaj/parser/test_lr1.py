@@ -38,6 +38,28 @@ class ParseTest(TestCase):
         self._assert_correct_tree(expected_tree, actual_root)
         self.assertRaises(ParserError, parse, tokens('11+1'), grammar, table)
 
+    def test_given_token_generator_then_ast(self) -> None:
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        table = table_for(grammar, graph_for(grammar))
+        actual_root = parse((token for token in tokens('0011')), grammar, table)
+        self._assert_correct_tree(('X', '0', ('X', '0', '1'), '1'), actual_root)
+
+    def test_given_release_mode_then_same_ast(self) -> None:
+        grammar = augment(Grammar(Rule('ADD', ['ADD', '+', 'MUL']), Rule('ADD', ['MUL']),
+                                  Rule('MUL', ['MUL', '*', '1']), Rule('MUL', ['1'])), 'ADD')
+        table = table_for(grammar, graph_for(grammar))
+        self.assertEqual(parse(tokens('1+1*1'), grammar, table), parse(tokens('1+1*1'), grammar, table, validate=False))
+        self.assertRaises(ParserError, parse, tokens('1+*1'), grammar, table, validate=False)
+
+    def test_given_deep_right_recursion_then_ast(self) -> None:
+        grammar = augment(Grammar(Rule('X', ['x', 'X']), Rule('X', ['x'])), 'X')
+        table = table_for(grammar, graph_for(grammar))
+        root = parse(tokens(20000 * 'x'), grammar, table, validate=False)
+        depth = 0
+        while root.children:
+            depth, root = depth + 1, root.children[-1]
+        self.assertEqual(20000, depth)
+
     def _assert_correct_tree(self, expected_nodes: Tuple[Any, ...], actual_root: Node) -> None:
         expected_root_key, expected_children = expected_nodes[0], expected_nodes[1:]
         self.assertEqual(expected_root_key, actual_root.key)
@@ -48,3 +70,140 @@ class ParseTest(TestCase):
 
 def tokens(keys: str) -> List[Node]:
     return [Node(key, token=Token(0, column, 'x')) for column, key in enumerate(keys)]
+
+
+class DenseParseTest(TestCase):
+    def test_given_dense_table_then_same_ast_as_parse_table(self) -> None:
+        from cmaj.parser.table import dense_table_for
+        grammar = augment(Grammar(Rule('ADD', ['ADD', '+', 'MUL']), Rule('ADD', ['MUL']),
+                                  Rule('MUL', ['MUL', '*', '1']), Rule('MUL', ['1'])), 'ADD')
+        table = table_for(grammar, graph_for(grammar))
+        dense_table = dense_table_for(table)
+        self.assertEqual(parse(tokens('1+1+1*1+1'), grammar, table), parse(tokens('1+1+1*1+1'), grammar, dense_table))
+
+    def test_given_dense_table_and_unexpected_token_then_error(self) -> None:
+        from cmaj.parser.table import dense_table_for
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        dense_table = dense_table_for(table_for(grammar, graph_for(grammar)))
+        self.assertRaises(ParserError, parse, tokens('001'), grammar, dense_table)
+        self.assertRaises(ParserError, parse, tokens('0011x'), grammar, dense_table)
+        self.assertRaises(ParserError, parse, tokens('0101'), grammar, dense_table)
+
+    def test_given_compressed_table_then_same_ast_and_errors_as_parse_table(self) -> None:
+        from cmaj.parser.table import compressed_table_for, dense_table_for
+        grammar = augment(Grammar(Rule('ADD', ['ADD', '+', 'MUL']), Rule('ADD', ['MUL']),
+                                  Rule('MUL', ['MUL', '*', '1']), Rule('MUL', ['1'])), 'ADD')
+        table = table_for(grammar, graph_for(grammar))
+        compressed_table = compressed_table_for(dense_table_for(table))
+        self.assertEqual(parse(tokens('1+1*1'), grammar, table), parse(tokens('1+1*1'), grammar, compressed_table))
+        self.assertRaises(ParserError, parse, tokens('1+*1'), grammar, compressed_table)
+        self.assertRaises(ParserError, parse, tokens('1+1+'), grammar, compressed_table)
+
+
+class PushParserTest(TestCase):
+    def test_given_tokens_fed_one_by_one_then_same_ast_as_parse(self) -> None:
+        from cmaj.parser.lr1 import Parser
+        grammar = augment(Grammar(Rule('ADD', ['ADD', '+', 'MUL']), Rule('ADD', ['MUL']),
+                                  Rule('MUL', ['MUL', '*', '1']), Rule('MUL', ['1'])), 'ADD')
+        table = table_for(grammar, graph_for(grammar))
+        parser = Parser(grammar, table)
+        for token in tokens('1+1*1'):
+            parser.feed(token)
+            self.assertTrue(parser.viable)
+        self.assertFalse(parser.accepted)
+        self.assertEqual(parse(tokens('1+1*1'), grammar, table), parser.finish())
+        self.assertTrue(parser.accepted)
+
+    def test_given_unexpected_token_then_rejected_immediately(self) -> None:
+        from cmaj.parser.lr1 import Parser
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        parser = Parser(grammar, table_for(grammar, graph_for(grammar)))
+        first, second, third, _ = tokens('0101')
+        parser.feed(first)
+        parser.feed(second)
+        self.assertRaises(ParserError, parser.feed, first)
+        self.assertFalse(parser.viable)
+        self.assertRaises(ParserError, parser.feed, third)
+        self.assertRaises(ParserError, parser.finish)
+
+    def test_given_incomplete_input_when_finish_then_error(self) -> None:
+        from cmaj.parser.lr1 import Parser
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        parser = Parser(grammar, table_for(grammar, graph_for(grammar)))
+        for token in tokens('001'):
+            parser.feed(token)
+        self.assertTrue(parser.viable)
+        self.assertRaises(ParserError, parser.finish)
+        self.assertFalse(parser.viable)
+
+
+class EvaluateTest(TestCase):
+    def test_given_arithmetic_callbacks_then_value_instead_of_ast(self) -> None:
+        from cmaj.parser.lr1 import evaluate
+        from cmaj.parser.table import compressed_table_for, dense_table_for
+        rules = [Rule('ADD', ['ADD', '+', 'MUL']), Rule('ADD', ['MUL']),
+                 Rule('MUL', ['MUL', '*', 'n']), Rule('MUL', ['n'])]
+        grammar = augment(Grammar(*rules), 'ADD')
+        callbacks = {rules[0]: lambda values: values[0] + values[2], rules[2]: lambda values: values[0] * values[2]}
+        table = table_for(grammar, graph_for(grammar))
+        numbers = [Node('n', token=Token(0, 0, '2')), Node('+'), Node('n', token=Token(0, 2, '3')), Node('*'),
+                   Node('n', token=Token(0, 4, '4'))]
+        for any_table in [table, dense_table_for(table), compressed_table_for(dense_table_for(table))]:
+            self.assertEqual(14, evaluate(numbers, grammar, any_table, callbacks, default=lambda values: values[0],
+                                          shift=lambda token: int(token.token.value) if token.token else None))
+
+    def test_given_missing_callback_then_error(self) -> None:
+        from cmaj.parser.lr1 import evaluate
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        table = table_for(grammar, graph_for(grammar))
+        self.assertRaises(ValueError, evaluate, tokens('01'), grammar, table, {Rule('X', ['0', '1']): len})
+        self.assertEqual(2, evaluate(tokens('01'), grammar, table, {}, default=len))
+
+
+class RecognizeTest(TestCase):
+    def test_given_valid_input_then_none_for_every_table(self) -> None:
+        from cmaj.parser.lr1 import recognize
+        from cmaj.parser.table import compressed_table_for, dense_table_for
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        table = table_for(grammar, graph_for(grammar))
+        for any_table in [table, dense_table_for(table), compressed_table_for(dense_table_for(table))]:
+            self.assertIsNone(recognize(tokens('000111'), grammar, any_table))
+            self.assertEqual(2, recognize(tokens('0101'), grammar, any_table))
+            self.assertEqual(3, recognize(tokens('001'), grammar, any_table))
+            self.assertEqual(4, recognize(tokens('0011x'), grammar, any_table))
+            self.assertEqual(0, recognize(tokens(''), grammar, any_table))
+
+
+class RecoveryTest(TestCase):
+    def test_given_errors_on_several_lines_then_diagnostics_and_partial_tree(self) -> None:
+        from cmaj.lexical.scanner import scan
+        from cmaj.meta.compiler import compile_grammar
+        from cmaj.meta.matchers import matchers
+        from cmaj.meta.parser import meta_grammar, meta_table
+        from cmaj.parser.lr1 import parse_with_recovery
+        lines = ['X = = Y\n', 'Y = "y"\n', 'Z = | W\n', 'W = "w"\n', 'V =\n', 'U = "u"\n']
+        root, diagnostics = parse_with_recovery(scan(lines, matchers()), meta_grammar(), meta_table(), {'eol'})
+        self.assertEqual([(0, 4), (2, 4), (4, 3)],
+                         [(diagnostic.token.token.line, diagnostic.token.token.column) for diagnostic in diagnostics])
+        self.assertEqual([2, 11, 20], [diagnostic.position for diagnostic in diagnostics])
+        self.assertEqual([Rule('Y', ['y']), Rule('W', ['w']), Rule('U', ['u'])], compile_grammar(root).rules)
+
+    def test_given_valid_input_then_no_diagnostics(self) -> None:
+        from cmaj.parser.lr1 import parse_with_recovery
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        table = table_for(grammar, graph_for(grammar))
+        root, diagnostics = parse_with_recovery(tokens('0011'), grammar, table, set())
+        self.assertEqual(parse(tokens('0011'), grammar, table), root)
+        self.assertEqual([], diagnostics)
+
+    def test_given_sync_token_then_resumed_else_no_tree(self) -> None:
+        from cmaj.parser.lr1 import parse_with_recovery
+        grammar = augment(Grammar(Rule('X', ['0', 'X', '1']), Rule('X', ['0', '1'])), 'X')
+        table = table_for(grammar, graph_for(grammar))
+        zero, _, one, _ = input_tokens = tokens('0110')
+        root, diagnostics = parse_with_recovery(input_tokens, grammar, table, {'1'})
+        self.assertEqual([zero, one], root.children)
+        self.assertEqual([2, 3], [diagnostic.position for diagnostic in diagnostics])
+        root, diagnostics = parse_with_recovery(tokens('00'), grammar, table, set())
+        self.assertIsNone(root)
+        self.assertEqual([2], [diagnostic.position for diagnostic in diagnostics])
@@ -97,3 +97,53 @@ def row_of(graph: ClosureGraph, rule_index: int, num_processed: int, lookahead:
                     lookahead in rule_state.lookaheads:
                 return index
     raise IndexError(f'No closure for ({rule_index}, {num_processed}, {lookahead!r}).')
+
+
+class DenseTableTest(TestCase):
+    def test_given_actions_then_encode_and_decode_are_inverse(self) -> None:
+        from cmaj.parser.table import DenseTable
+        for action in [Action.shift(0), Action.goto(7), Action.reduce(3), Action.accept(12), None]:
+            self.assertEqual(action, DenseTable.decode(DenseTable.encode(action)))
+        self.assertEqual(0, DenseTable.encode(None))
+
+    def test_given_parse_table_then_dense_table_with_same_actions(self) -> None:
+        from cmaj.parser.grammar import augment
+        from cmaj.parser.graph import graph_for
+        from cmaj.parser.table import dense_table_for
+        grammar = augment(Grammar(Rule('S', ['X', 'X']), Rule('X', ['a', 'X']), Rule('X', ['b'])), 'S')
+        table = table_for(grammar, graph_for(grammar))
+        dense_table = dense_table_for(table)
+        self.assertEqual((table.num_rows, table.num_columns), (dense_table.num_rows, dense_table.num_columns))
+        self.assertEqual(table.num_rows * table.num_columns, len(dense_table.codes))
+        for row in range(table.num_rows):
+            for symbol in table.symbols:
+                self.assertEqual(table.action(row, symbol), dense_table.action(row, symbol))
+
+
+class CompressedTableTest(TestCase):
+    def test_given_dense_table_then_compressed_table_with_same_non_error_codes(self) -> None:
+        from cmaj.meta.parser import meta_table
+        from cmaj.parser.table import compressed_table_for, dense_table_for
+        dense_table = dense_table_for(meta_table())
+        compressed_table = compressed_table_for(dense_table)
+        self.assertEqual((dense_table.num_rows, dense_table.num_columns),
+                         (compressed_table.num_rows, compressed_table.num_columns))
+        for row in range(dense_table.num_rows):
+            for column in range(dense_table.num_columns):
+                if code := dense_table.code(row, column):
+                    self.assertEqual(code, compressed_table.code(row, column))
+        self.assertGreater(compressed_table.compression_ratio, 1)
+
+    def test_given_rows_with_reductions_then_most_common_reduction_is_default(self) -> None:
+        from cmaj.parser.table import DenseTable, compressed_table_for
+        reduce_0, reduce_1 = DenseTable.encode(Action.reduce(0)), DenseTable.encode(Action.reduce(1))
+        shift = DenseTable.encode(Action.shift(1))
+        dense_table = DenseTable(3, ['a', 'b', 'c', 'd'])
+        for row in range(2):
+            for column, code in enumerate([reduce_0, reduce_1, reduce_1, shift]):
+                dense_table.set_code(row, column, code)
+        compressed_table = compressed_table_for(dense_table)
+        self.assertEqual([reduce_0, reduce_1, reduce_1, shift], [compressed_table.code(0, c) for c in range(4)])
+        self.assertEqual(reduce_1, compressed_table.code(1, 1))
+        self.assertEqual([0, 0, 0, 0], [compressed_table.code(2, c) for c in range(4)])
+        self.assertEqual(Action.shift(1), compressed_table.action(1, 'd'))
@@ -1,6 +1,11 @@
-from typing import List
+from typing import Iterator, List
 
 
 def read(filename: str) -> List[str]:
     with open(filename) as file:
         return file.readlines()
+
+
+def stream(filename: str) -> Iterator[str]:
+    with open(filename) as file:
+        yield from file